@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Design board payload benchmark.
+
+Builds synthetic design boards of increasing size (default 1k to 16k
+issues) shaped like build_design_board's records, and compares the old
+array-of-objects ISSUES payload with the columnar one (columnar.py):
+JSON size, gzipped size, and best-of-5 json.loads time. Checks that the
+columnar payload decodes back to the same records.
+
+Usage:
+    python3 benchmarks/bench_columnar.py [MAX_ISSUES]
+"""
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import decode, encode
+
+COLUMNS = ('key', 'project', 'type', 'summary', 'priority', 'status', 'statusCategory',
+           'assignee', 'labels', 'updated', 'parent')
+CATEGORICAL = ('project', 'type', 'priority', 'status', 'statusCategory', 'assignee',
+               'labels', 'updated', 'parent')
+PROJECTS = ['APEX', 'BAI', 'CBP', 'CLN', 'DA', 'DD', 'DDINDIA', 'QUAL', 'RHL', 'SENG', 'PRDS', 'DDB']
+STATUSES = [('To Do', 'todo'), ('In Progress', 'in_progress'), ('In Review', 'review'), ('Done', 'done'),
+            ('Backlog', 'backlog'), ('QA', 'review'), ('Ready for Dev', 'todo'), ('Blocked', 'backlog')]
+WORDS = 'design spec banner badge visual flow page redesign figma ux ui borrower loan dashboard modal form'.split()
+
+
+def make_issues(n, seed=7):
+    rnd = random.Random(seed)
+    assignees = [f'Designer {i}' for i in range(60)] + ['Unassigned']
+    parents = [f'Epic {i}: ' + ' '.join(rnd.choices(WORDS, k=4)) for i in range(n // 20 + 1)] + ['']
+    issues = []
+    for i in range(n):
+        proj = rnd.choice(PROJECTS)
+        status, cat = rnd.choice(STATUSES)
+        issues.append({
+            'key': f'{proj}-{rnd.randint(1, 9999)}',
+            'project': proj,
+            'type': rnd.choice(['Story', 'Task', 'Bug', 'Sub-task']),
+            'summary': ' '.join(rnd.choices(WORDS, k=rnd.randint(4, 12))).capitalize(),
+            'priority': rnd.choice(['P0 (Blocking)', 'P1 (Critical)', 'P2 (Major)', 'P3 (Minor)', 'P4 (Trivial)']),
+            'status': status,
+            'statusCategory': cat,
+            'assignee': rnd.choice(assignees),
+            'labels': ['design'] + rnd.sample(['ux', 'ui-design', 'figma', 'fifth-third', 'q3'], rnd.randint(0, 2)),
+            'updated': f"{rnd.choice(['Jan', 'Feb', 'Mar', 'Apr'])} {rnd.randint(1, 28):02d}",
+            'parent': rnd.choice(parents),
+        })
+    return issues
+
+
+def best_load(body, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        json.loads(body)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    max_issues = int(sys.argv[1]) if len(sys.argv) > 1 else 16_000
+    sizes = []
+    n = 1_000
+    while n <= max_issues:
+        sizes.append(n)
+        n *= 2
+
+    print(f"{'issues':>8s} {'rows KB':>8s} {'cols KB':>8s} {'rows gz':>8s} {'cols gz':>8s} {'rows parse':>11s} {'cols parse':>11s}")
+    for n in sizes:
+        issues = make_issues(n)
+        payload = encode(issues, COLUMNS, CATEGORICAL)
+        if decode(payload) != issues:
+            sys.exit(f'MISMATCH: columnar payload does not decode back at {n} issues')
+        rows = json.dumps(issues, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        cols = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        print(f'{n:8,d} {len(rows) / 1024:8.0f} {len(cols) / 1024:8.0f} '
+              f'{len(gzip.compress(rows)) / 1024:8.0f} {len(gzip.compress(cols)) / 1024:8.0f} '
+              f'{best_load(rows) * 1e3:9.1f}ms {best_load(cols) * 1e3:9.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Epic progress benchmark.
+
+Generates a synthetic epic/child stream (default 50k epics, 1M children),
+checks that epic_progress.EpicProgress produces the same epic rows, project
+groups and totals as the original dict-of-dicts build plus four-scans-per-
+epic loop from build_epic_report, and reports the wall time of each from the
+same parsed child stream.
+
+Usage:
+    python3 benchmarks/bench_epic_progress.py [N_EPICS] [N_CHILDREN]
+"""
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from epic_progress import EpicProgress
+
+PROJECTS = ['APEX', 'BAI', 'CBP', 'CLN', 'DA', 'DD', 'DDINDIA', 'QUAL', 'RHL', 'SENG']
+PRIORITIES = ['P0 - Critical', 'P1 - High', 'P2 - Medium', 'P3 - Low', 'P4 - Trivial', '']
+STATUSES = [('To Do', 'To Do'), ('In Progress', 'In Progress'), ('Blocked', 'In Progress'),
+            ('Code Review', 'In Progress'), ('Done', 'Done'), ('Backlog', '')]
+TYPES = ['Story', 'Story', 'Task', 'Bug', 'Sub-task']
+
+
+def legacy_ingest(child_stream):
+    """epic_children as build_epic_report used to fill it."""
+    epic_children = {}
+    for pk, child in child_stream:
+        if pk not in epic_children:
+            epic_children[pk] = {}
+        epic_children[pk][child['key']] = child
+    return epic_children
+
+
+def legacy_progress(all_epics, epic_children):
+    """The epic_data / projects / totals construction as it was in build_epic_report."""
+    epic_data = {}
+    for key, ep in all_epics.items():
+        children = list(epic_children.get(key, {}).values())
+        bugs = [c for c in children if c.get('type', '').lower() == 'bug']
+        done = sum(1 for c in children if c.get('status_cat') == 'Done')
+        in_prog = sum(1 for c in children if c.get('status_cat') == 'In Progress')
+        todo = sum(1 for c in children if c.get('status_cat') == 'To Do')
+        epic_data[key] = {
+            **ep,
+            'stories': children,
+            'story_count': len(children),
+            'bug_count': len(bugs),
+            'done': done,
+            'in_progress': in_prog,
+            'todo': todo,
+        }
+
+    projects = {}
+    for key, ep in epic_data.items():
+        proj = ep.get('project', key.split('-')[0])
+        if proj not in projects:
+            projects[proj] = []
+        projects[proj].append(ep)
+
+    priority_order = {'P0': 0, 'P1': 1, 'P2': 2, 'P3': 3, 'P4': 4}
+    for proj in projects:
+        projects[proj].sort(key=lambda e: (priority_order.get(e.get('priority', '')[:2], 5), e['key']))
+
+    # Aggregates main() then computed with further scans of the epics
+    project_totals = {}
+    for proj, eps in projects.items():
+        project_totals[proj] = {
+            'epics': len(eps),
+            'story_count': sum(e['story_count'] for e in eps),
+            'bug_count': sum(e['bug_count'] for e in eps),
+            'done': sum(e['done'] for e in eps),
+            'active': sum(1 for e in eps if 'Progress' in e.get('status', '')),
+            'blocked': sum(1 for e in eps if 'Block' in e.get('status', '')),
+        }
+    totals = {
+        'epics': len(epic_data),
+        'story_count': sum(e['story_count'] for e in epic_data.values()),
+        'bug_count': sum(e['bug_count'] for e in epic_data.values()),
+        'todo': sum(1 for e in epic_data.values() if e.get('status_cat') == 'To Do' or (not e.get('status_cat') and 'To Do' in e.get('status', ''))),
+        'in_progress': sum(1 for e in epic_data.values() if 'Progress' in e.get('status', '')),
+        'blocked': sum(1 for e in epic_data.values() if 'Block' in e.get('status', '')),
+    }
+    priority_counts = {p: sum(1 for e in epic_data.values() if p in e.get('priority', ''))
+                       for p in ('P0', 'P1', 'P2', 'P3')}
+    return epic_data, projects, project_totals, totals, priority_counts
+
+
+def make_data(n_epics, n_children, seed=11):
+    rnd = random.Random(seed)
+    all_epics = {}
+    for i in range(n_epics):
+        proj = rnd.choice(PROJECTS)
+        status, cat = rnd.choice(STATUSES)
+        key = f'{proj}-{i}'
+        all_epics[key] = {'key': key, 'summary': f'Epic {i}', 'status': status, 'status_cat': cat,
+                          'priority': rnd.choice(PRIORITIES), 'assignee': 'Someone', 'project': proj}
+    keys = list(all_epics)
+    child_stream = []
+    for i in range(n_children):
+        parent = keys[min(int(rnd.expovariate(1.0) * n_epics / 4), n_epics - 1)]
+        status, cat = rnd.choice(STATUSES)
+        ckey = f'C-{i}'
+        child_stream.append((parent, {'key': ckey, 'status': status, 'status_cat': cat,
+                                      'type': rnd.choice(TYPES), 'parent_key': parent}))
+    return all_epics, child_stream
+
+
+def ingest(child_stream):
+    progress = EpicProgress()
+    progress.add_children(child_stream)
+    return progress
+
+
+def timed(fn, *args, rounds=3):
+    """(result, best wall time of `rounds` runs)."""
+    best = float('inf')
+    for _ in range(rounds):
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def main():
+    n_epics = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_children = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    all_epics, child_stream = make_data(n_epics, n_children)
+
+    epic_children, legacy_in = timed(legacy_ingest, child_stream)
+    (epic_data, projects, project_totals, totals, priority_counts), legacy = \
+        timed(legacy_progress, all_epics, epic_children)
+    progress, single_in = timed(ingest, child_stream)
+    progress, single = timed(progress.finalize, all_epics)
+
+    if progress.epics != epic_data:
+        sys.exit('MISMATCH in per-epic counters')
+    if {p: [e['key'] for e in eps] for p, eps in progress.projects.items()} != \
+            {p: [e['key'] for e in eps] for p, eps in projects.items()}:
+        sys.exit('MISMATCH in project grouping / priority order')
+    if (progress.project_totals, progress.totals, progress.priority_counts) != \
+            (project_totals, totals, priority_counts):
+        sys.exit('MISMATCH in project / report totals')
+
+    print(f'Epics:       {n_epics:,}  Children: {n_children:,}  (results identical)')
+    print(f'Legacy:      {legacy:.2f}s progress  ({legacy_in + legacy:.2f}s with child ingest)')
+    print(f'Single pass: {single:.2f}s progress  ({single_in + single:.2f}s with child ingest)'
+          f'  {legacy / single:.2f}x / {(legacy_in + legacy) / (single_in + single):.2f}x')
+
+
+if __name__ == '__main__':
+    main()
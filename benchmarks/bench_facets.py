@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Design board filter benchmark.
+
+Builds a synthetic board (default 20k issues, see bench_columnar), runs
+design-board.html's script under node with a stub DOM, and times a
+sequence of filter clicks: the visible-set computation alone (facet
+bitsets ANDed) and the whole renderBoard() call, which redraws only the
+columns whose cards changed (cards' HTML is built once and reused).
+A frame is ~16ms. Requires node on PATH.
+
+Usage:
+    python3 benchmarks/bench_facets.py [ISSUES]
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_columnar import make_issues
+
+try:
+    from build_design_board import board_data
+except SystemExit:
+    sys.exit("build_design_board needs 'requests' importable. Run: pip install requests")
+
+HARNESS = r'''
+const fs = require('fs'), vm = require('vm');
+const [page, data] = process.argv.slice(2);
+const script = fs.readFileSync(page, 'utf8').match(/<script>([\s\S]*?)<\/script>/)[1];
+const els = {};
+const el = id => els[id] || (els[id] = {innerHTML: '', textContent: '', classList: {add() {}, remove() {}, contains: () => false},
+  dataset: {}, parentNode: {insertBefore() {}}, nextSibling: {}, querySelectorAll: () => [el('x'), el('y'), el('z')]});
+const ctx = {console, atob, Promise, setTimeout, Set, Map, Uint32Array, Math, Object, location: {protocol: 'http:'},
+  Chart: Object.assign(function () {}, {defaults: {font: {}}}),
+  document: {getElementById: el, createElement: () => el(Math.random()), head: {appendChild() {}}}};
+vm.createContext(ctx);
+vm.runInContext(script.replace('let ISSUES = null;', 'let ISSUES = ' + fs.readFileSync(data, 'utf8') + ';'), ctx);
+const clicks = [['project', 'CBP'], ['type', 'Bug'], ['priority', 'P1'], ['project', 'all'], ['type', 'all'],
+                ['priority', 'all'], ['project', 'SENG'], ['priority', 'P0'], ['project', 'all'], ['priority', 'all']];
+const now = () => Number(process.hrtime.bigint()) / 1e6;
+let worstFilter = 0, worstRender = 0;
+for (let round = 0; round < 3; round++) {
+  for (const [dim, v] of clicks) {
+    vm.runInContext(`activeFilters.${dim} = '${v}';`, ctx);
+    let t = now();
+    vm.runInContext('visibleBits();', ctx);
+    worstFilter = Math.max(worstFilter, now() - t);
+    t = now();
+    vm.runInContext('renderBoard();', ctx);
+    if (round) worstRender = Math.max(worstRender, now() - t);  // round 0 builds the cards' HTML
+  }
+}
+console.log(JSON.stringify({filter: worstFilter, render: worstRender}));
+'''
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    if not shutil.which('node'):
+        sys.exit('node not found on PATH')
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.path.join(tmp, 'board.json')
+        with open(data, 'w') as f:
+            json.dump(board_data(make_issues(n)), f, ensure_ascii=False, separators=(',', ':'))
+        harness = os.path.join(tmp, 'harness.js')
+        with open(harness, 'w') as f:
+            f.write(HARNESS)
+        res = subprocess.run(['node', harness, os.path.join(ROOT, 'design-board.html'), data],
+                             check=True, capture_output=True, text=True)
+    t = json.loads(res.stdout)
+    print(f'{n:,d} issues: worst filter (bitset AND) {t["filter"]:.2f}ms, '
+          f'worst renderBoard (changed columns only) {t["render"]:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
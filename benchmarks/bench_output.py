@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Report output memory benchmark.
+
+Writes synthetic leaderboard reports of increasing size (default 50k to
+400k rows, ~0.6 KB each) the way the builders used to — the whole page
+rendered into a buffer, then written out — and streamed section by section
+through output.atomic_output. Each run is a fresh interpreter so the peak
+RSS it reports is that run's alone; the baseline row is an interpreter that
+only generates the rows. Checks that both files are identical.
+
+Usage:
+    python3 benchmarks/bench_output.py [MAX_ROWS]
+"""
+import filecmp
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_render import COLORS, PROJECTS, ROW
+from output import atomic_output, peak_rss_mb
+
+
+def iter_rows(n):
+    """make_rows(n) one row at a time, so the rows themselves take no memory."""
+    for i in range(n):
+        projs = (i % len(PROJECTS), (i * 7 + 3) % len(PROJECTS))
+        issues, sp = i % 200 + 1, i * 13 % 400
+        yield {
+            'rank': i + 1,
+            'rank_class': f'rank-{i + 1}' if i < 3 else '',
+            'rank_bg': '' if i < 3 else 'background:rgba(99,102,241,.12);color:#818cf8',
+            'name': f'Engineer {i}',
+            'proj_tags': ''.join(f'<span class="proj-tag" style="background:{COLORS[p]}22;color:{COLORS[p]}">{PROJECTS[p]}</span>'
+                                 for p in projs),
+            'total_issues': issues,
+            'total_sp': float(sp),
+            'avg_sp_per_issue': round(sp / issues, 1),
+            'bar_pct': sp / 4,
+            'bar_color': COLORS[projs[0]],
+        }
+
+
+def run(mode, n, path):
+    if mode == 'buffered':
+        out = io.StringIO()
+        ROW.render_each(out, iter_rows(n))
+        with open(path, 'w') as f:
+            f.write(out.getvalue())
+    elif mode == 'streamed':
+        with atomic_output(path) as out:
+            ROW.render_each(out, iter_rows(n))
+    else:
+        for _ in iter_rows(n):
+            pass
+    print(f'{peak_rss_mb():.1f}')
+
+
+def measure(mode, n, path):
+    t0 = time.perf_counter()
+    res = subprocess.run([sys.executable, __file__, '--run', mode, str(n), path],
+                         check=True, capture_output=True, text=True)
+    return float(res.stdout), time.perf_counter() - t0
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    sizes = []
+    n = 50_000
+    while n <= max_rows:
+        sizes.append(n)
+        n *= 2
+
+    print(f"{'rows':>8s} {'size':>8s} {'baseline':>9s} {'buffered':>9s} {'streamed':>9s}  (peak RSS, MiB; wall s)")
+    with tempfile.TemporaryDirectory() as tmp:
+        buffered, streamed = os.path.join(tmp, 'buffered.html'), os.path.join(tmp, 'streamed.html')
+        for n in sizes:
+            base, _ = measure('baseline', n, '')
+            rss_b, t_b = measure('buffered', n, buffered)
+            rss_s, t_s = measure('streamed', n, streamed)
+            if not filecmp.cmp(buffered, streamed, shallow=False):
+                sys.exit(f'MISMATCH: streamed output differs from buffered at {n} rows')
+            size = os.path.getsize(streamed) / (1024 * 1024)
+            print(f'{n:8,d} {size:6.0f}MB {base:9.1f} {rss_b:9.1f} {rss_s:9.1f}  ({t_b:.1f}s / {t_s:.1f}s)')
+    print('(output identical; streamed peak stays at baseline whatever the report size)')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--run']:
+        run(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+    else:
+        main()
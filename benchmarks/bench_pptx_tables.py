@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""OCE ticket table benchmark.
+
+Lays out synthetic P0/P1 ticket rows (default 600, some with summaries
+long enough to wrap) shaped like create_oce_ppt's table over as many slides
+as they need, twice: styling every cell through python-pptx properties, as
+create_oce_ppt used to, and with pptx_tables.BulkTable's cell XML
+templates, both split into BulkTable's pages. Reports best-of-3 build time
+for each and checks that both decks hold the same text and fills.
+Requires python-pptx.
+
+Usage:
+    python3 benchmarks/bench_pptx_tables.py [ROWS]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from pptx import Presentation
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches, Pt
+except ImportError:
+    sys.exit('python-pptx not installed. Run: pip install python-pptx')
+
+from pptx_tables import BulkTable, CellStyle, TableStyle
+
+HEADERS = ['Ticket', 'Project', 'Summary', 'Priority', 'Status', 'Assignee']
+COL_WIDTHS = [Inches(1.1), Inches(0.7), Inches(5.4), Inches(0.8), Inches(1.4), Inches(1.8)]
+LEFT, TOP, BOTTOM = Inches(0.5), Inches(1.2), Inches(7.3)
+TEXT_GRAY = RGBColor(0x94, 0xA3, 0xB8)
+TEXT_WHITE = RGBColor(0xE2, 0xE8, 0xF0)
+BG_CARD = RGBColor(0x11, 0x18, 0x27)
+DARK = RGBColor(0x0D, 0x11, 0x1E)
+STYLE = TableStyle(CellStyle(size=9, color=TEXT_GRAY, bold=True, fill=DARK),
+                   [CellStyle(size=8, color=TEXT_WHITE, fill=BG_CARD), CellStyle(size=8, color=TEXT_WHITE, fill=DARK)])
+WORDS = 'TeachersFCU BMO PL document upload screen stuck tenant credit pull collateral eSign app data'.split()
+
+
+def make_rows(n, seed=3):
+    rnd = random.Random(seed)
+    projects = ['CBP', 'CLN', 'DD', 'SENG', 'DDINDIA', 'RHL', 'DA']
+    return [[f'{rnd.choice(projects)}-{rnd.randint(100, 13999)}', rnd.choice(projects),
+             ' '.join(rnd.choices(WORDS, k=rnd.randint(3, 8) if rnd.random() < 0.9 else rnd.randint(12, 30))),
+             rnd.choice(['P0', 'P1']),
+             rnd.choice(['To Do', 'Dev In Progress', 'Blocked', 'In Review']),
+             rnd.choice(['Unassigned', 'Suyog Bhatia', 'Kalpana Sharma', 'Bukka V Reddy'])]
+            for _ in range(n)]
+
+
+def deck():
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(13.333), Inches(7.5)
+    return prs
+
+
+def per_cell(rows, page_sizes):
+    """The table the old way: one python-pptx property call per styled cell property."""
+    prs = deck()
+    start = 0
+    for size in page_sizes:
+        page = rows[start:start + size]
+        start += size
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        table = slide.shapes.add_table(len(page) + 1, len(HEADERS), LEFT, TOP, Inches(11.2),
+                                       Inches(0.35) * (len(page) + 1)).table
+        for i, w in enumerate(COL_WIDTHS):
+            table.columns[i].width = w
+        for i, h in enumerate(HEADERS):
+            cell = table.cell(0, i)
+            cell.text = h
+            for paragraph in cell.text_frame.paragraphs:
+                paragraph.font.size = Pt(9)
+                paragraph.font.bold = True
+                paragraph.font.color.rgb = TEXT_GRAY
+                paragraph.font.name = 'Segoe UI'
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = DARK
+        for r_idx, row in enumerate(page):
+            for c_idx, val in enumerate(row):
+                cell = table.cell(r_idx + 1, c_idx)
+                cell.text = str(val)
+                for paragraph in cell.text_frame.paragraphs:
+                    paragraph.font.size = Pt(8)
+                    paragraph.font.color.rgb = TEXT_WHITE
+                    paragraph.font.name = 'Segoe UI'
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = BG_CARD if r_idx % 2 == 0 else DARK
+    return prs
+
+
+def bulk(rows):
+    prs = deck()
+    BulkTable(HEADERS, COL_WIDTHS, STYLE).add_paged(
+        lambda page, pages: prs.slides.add_slide(prs.slide_layouts[6]), rows, LEFT, TOP, BOTTOM)
+    return prs
+
+
+def cells(prs):
+    return [(c.text, str(c.fill.fore_color.rgb))
+            for slide in prs.slides for shape in slide.shapes if shape.has_table
+            for row in shape.table.rows for c in row.cells]
+
+
+def best(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    rows = make_rows(n)
+    page_sizes = [len(p) for p in BulkTable(HEADERS, COL_WIDTHS, STYLE).pages(rows, TOP, BOTTOM)]
+    old_time, old = best(lambda: per_cell(rows, page_sizes))
+    new_time, new = best(lambda: bulk(rows))
+    if cells(old) != cells(new):
+        sys.exit('MISMATCH: bulk table text or fills differ from the per-cell table')
+    print(f'{n:,d} rows x {len(HEADERS)} columns on {len(new.slides)} slides '
+          f'({min(page_sizes)}-{max(page_sizes)} rows each)')
+    print(f'  per-cell properties: {old_time * 1e3:8.1f}ms')
+    print(f'  BulkTable templates: {new_time * 1e3:8.1f}ms  ({old_time / new_time:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Leaderboard render benchmark.
+
+Renders synthetic engineer leaderboards of increasing size (default 1k to
+16k rows) with the productivity report's row markup, once the old way
+(an f-string per row appended with `html +=`) and once with a precompiled
+templates.Template written into an io.StringIO, checks that both produce
+the same HTML, and prints the wall time and time per row of each so the
+scaling is visible.
+
+Usage:
+    python3 benchmarks/bench_render.py [MAX_ROWS]
+"""
+import gc
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import Template
+
+PROJECTS = ['APEX', 'BAI', 'CBP', 'CLN', 'DA', 'DD', 'DDINDIA', 'QUAL', 'RHL', 'SENG']
+COLORS = ['#818cf8', '#34d399', '#fb923c', '#f87171', '#60a5fa', '#c084fc', '#fbbf24', '#22d3ee', '#4ade80', '#f472b6']
+
+ROW = Template('''<tr>
+  <td><span class="rank {{ rank_class }}" style="{{ rank_bg }}">{{ rank }}</span></td>
+  <td style="font-weight:600">{{ name }}</td>
+  <td>{{ proj_tags }}</td>
+  <td style="text-align:right;font-weight:700">{{ total_issues }}</td>
+  <td style="text-align:right;font-weight:700;color:#a5b4fc">{{ total_sp:.0f }}</td>
+  <td style="text-align:right">{{ avg_sp_per_issue }}</td>
+  <td><div class="bar-container"><div class="bar-fill" style="width:{{ bar_pct:.0f }}%;background:{{ bar_color }}"></div></div></td>
+</tr>
+''')
+
+
+def make_rows(n, seed=11):
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rank = i + 1
+        projs = rnd.sample(range(len(PROJECTS)), rnd.randint(1, 3))
+        issues = rnd.randint(1, 200)
+        sp = rnd.randint(0, 400)
+        rows.append({
+            'rank': rank,
+            'rank_class': f'rank-{rank}' if rank <= 3 else '',
+            'rank_bg': '' if rank <= 3 else 'background:rgba(99,102,241,.12);color:#818cf8',
+            'name': f'Engineer {i}',
+            'proj_tags': ''.join(f'<span class="proj-tag" style="background:{COLORS[p]}22;color:{COLORS[p]}">{PROJECTS[p]}</span>'
+                                 for p in projs),
+            'total_issues': issues,
+            'total_sp': float(sp),
+            'avg_sp_per_issue': round(sp / issues, 1),
+            'bar_pct': sp / 4,
+            'bar_color': COLORS[projs[0]],
+        })
+    return rows
+
+
+def legacy_render(rows):
+    """The per-row f-string concatenation build_productivity_report used."""
+    html = ''
+    for r in rows:
+        html += f'''<tr>
+  <td><span class="rank {r['rank_class']}" style="{r['rank_bg']}">{r['rank']}</span></td>
+  <td style="font-weight:600">{r['name']}</td>
+  <td>{r['proj_tags']}</td>
+  <td style="text-align:right;font-weight:700">{r['total_issues']}</td>
+  <td style="text-align:right;font-weight:700;color:#a5b4fc">{r['total_sp']:.0f}</td>
+  <td style="text-align:right">{r['avg_sp_per_issue']}</td>
+  <td><div class="bar-container"><div class="bar-fill" style="width:{r['bar_pct']:.0f}%;background:{r['bar_color']}"></div></div></td>
+</tr>
+'''
+    return html
+
+
+def template_render(rows):
+    out = io.StringIO()
+    ROW.render_each(out, rows)
+    return out.getvalue()
+
+
+def best_of(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn(*args)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return out, best
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 16_000
+    sizes = []
+    n = 1_000
+    while n <= max_rows:
+        sizes.append(n)
+        n *= 2
+
+    print(f"{'rows':>8s} {'legacy':>10s} {'us/row':>8s} {'template':>10s} {'us/row':>8s}")
+    for n in sizes:
+        rows = make_rows(n)
+        old, t_old = best_of(legacy_render, rows)
+        new, t_new = best_of(template_render, rows)
+        if old != new:
+            sys.exit(f'MISMATCH: template output differs from legacy at {n} rows')
+        print(f'{n:8,d} {t_old * 1e3:8.1f}ms {t_old / n * 1e6:8.2f} {t_new * 1e3:8.1f}ms {t_new / n * 1e6:8.2f}')
+    print('(output identical; flat us/row means linear scaling)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Snapshot store growth and trend-query benchmark.
+
+Simulates a year of hourly builder runs over a synthetic issue set in which
+a small fraction of issues change status per run, then reports the on-disk
+size of the series against a full copy per run, and the time of a one-year
+metric trend query and status-count replay.
+
+Usage:
+    python3 benchmarks/bench_snapshots.py [N_ISSUES] [N_RUNS]
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshots import SnapshotStore
+
+STATUSES = ['To Do', 'In Progress', 'Code Review', 'QA', 'Done']
+
+
+def main():
+    n_issues = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    n_runs = int(sys.argv[2]) if len(sys.argv) > 2 else 24 * 365
+    rnd = random.Random(3)
+    root = tempfile.mkdtemp(prefix='snapshots-')
+    try:
+        store = SnapshotStore('bench', root=root)
+        status = {f'OCE-{i}': rnd.choice(STATUSES) for i in range(n_issues)}
+        full_size = 0
+        t0 = 1_735_689_600  # 2025-01-01
+        start = time.perf_counter()
+        for run in range(n_runs):
+            if rnd.random() < 0.3:  # most hourly runs see no change at all
+                for key in rnd.sample(list(status), max(1, n_issues // 500)):
+                    status[key] = rnd.choice(STATUSES)
+            open_ = sum(1 for s in status.values() if s != 'Done')
+            store.append({'total': len(status), 'open': open_}, status, ts=t0 + run * 3600)
+            if run == 0:
+                full_size = len(json.dumps(status))
+        write = time.perf_counter() - start
+
+        size = sum(os.path.getsize(os.path.join(root, f)) for f in os.listdir(root))
+        start = time.perf_counter()
+        trend = store.metric_series(['open'], since=t0, until=t0 + n_runs * 3600)
+        metric_q = time.perf_counter() - start
+        start = time.perf_counter()
+        counts = store.status_counts(since=t0)
+        status_q = time.perf_counter() - start
+    finally:
+        shutil.rmtree(root)
+
+    print(f'Runs:          {n_runs:,} over {n_issues:,} issues ({write:.1f}s to write)')
+    print(f'Store size:    {size / 1e6:.2f} MB  (full copy per run: {full_size * n_runs / 1e6:,.0f} MB)')
+    print(f'Metric trend:  {len(trend["t"]):,} points in {metric_q * 1000:.1f} ms')
+    print(f'Status counts: {len(counts):,} points in {status_q * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
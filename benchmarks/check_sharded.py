@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Sharded-equals-serial check and timing for mapreduce.
+
+Builds synthetic productivity issues and an epic/child mapping, runs every
+mapreduce rollup serially (workers=1) and sharded across a process pool,
+exits non-zero if any output differs, and prints both wall times.
+
+Usage:
+    python3 benchmarks/check_sharded.py [N_ISSUES] [WORKERS]
+"""
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import mapreduce
+from bench_epic_progress import make_data
+from breakdowns import DESIGN_FIELDS
+
+PROJECTS = ['APEX', 'BAI', 'CBP', 'CLN', 'DA', 'DD', 'DDINDIA', 'QUAL', 'RHL', 'SENG']
+PERIODS = [f'Q{q} {y}' for y in (2023, 2024, 2025) for q in (1, 2, 3, 4)] + ['Unknown']
+STATUSES = ['To Do', 'In Progress', 'Done', 'Code Review']
+CATEGORIES = ['To Do', 'In Progress', 'Done']
+
+
+def make_issues(n, seed=5):
+    rnd = random.Random(seed)
+    engineers = [f'Engineer {i}' for i in range(400)]
+    issues, periods = [], []
+    for i in range(n):
+        proj = rnd.choice(PROJECTS)
+        issues.append({
+            'key': f'{proj}-{i}', 'project': proj, 'assignee': rnd.choice(engineers),
+            'sp': rnd.choice([None, 1, 2, 3, 5, 8, 0.5]),
+            'status': rnd.choice(STATUSES), 'statusCategory': rnd.choice(CATEGORIES),
+            'priority': rnd.choice(['P0', 'P1', 'P2', 'P3']), 'type': rnd.choice(['Story', 'Bug', 'Task']),
+        })
+        periods.append(rnd.choice(PERIODS))
+    return issues, periods
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def check(name, serial, sharded):
+    if serial != sharded:
+        sys.exit(f'MISMATCH: sharded {name} differs from serial')
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else mapreduce.default_workers()
+    issues, periods = make_issues(n)
+    all_epics, child_stream = make_data(n // 20, n)
+    children = {}
+    for pk, child in child_stream:
+        children.setdefault(pk, {})[child['key']] = child
+
+    rows = []
+
+    a, t_serial = timed(mapreduce.productivity_rollup, issues, periods, workers=1)
+    b, t_sharded = timed(mapreduce.productivity_rollup, issues, periods, workers=workers)
+    check('project summary', a.project_summary(), b.project_summary())
+    check('leaderboard', a.leaderboard(), b.leaderboard())
+    check('period x project', a.by_period_project(PERIODS), b.by_period_project(PERIODS))
+    check('totals', (a.total_issues, a.total_sp), (b.total_issues, b.total_sp))
+    rows.append(('productivity', t_serial, t_sharded))
+
+    a, t_serial = timed(mapreduce.epic_progress, all_epics, children, workers=1)
+    b, t_sharded = timed(mapreduce.epic_progress, all_epics, children, workers=workers)
+    check('epic rows', a.epics, b.epics)
+    check('epic groups', {p: [e['key'] for e in eps] for p, eps in a.projects.items()},
+          {p: [e['key'] for e in eps] for p, eps in b.projects.items()})
+    check('epic totals', (a.project_totals, a.totals, a.priority_counts),
+          (b.project_totals, b.totals, b.priority_counts))
+    rows.append(('epic progress', t_serial, t_sharded))
+
+    a, t_serial = timed(mapreduce.breakdowns, issues, workers=1)
+    b, t_sharded = timed(mapreduce.breakdowns, issues, workers=workers)
+    check('breakdowns', ({f: a.by(f) for f in DESIGN_FIELDS}, dict(a.done), a.total),
+          ({f: b.by(f) for f in DESIGN_FIELDS}, dict(b.done), b.total))
+    rows.append(('breakdowns', t_serial, t_sharded))
+
+    print(f'{n:,} issues, {len(all_epics):,} epics, {workers} workers: sharded output identical to serial')
+    for name, s, p in rows:
+        print(f'  {name:14s} serial {s:6.2f}s   sharded {p:6.2f}s   ({s / p:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
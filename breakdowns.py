@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Single-pass count breakdowns over a stream of issue dicts.
+
+Breakdowns is fed one issue at a time (typically right after it is
+classified or parsed) and keeps a counter per field value for every field it
+was asked to track, plus a done/open split per group. All of it costs one
+dict update per field per issue, so summaries scale linearly with the issue
+count, and two Breakdowns over disjoint issue sets can be merged. `remove`
+takes an issue's earlier `add` back, so counts kept across runs (see
+extract_design_issues.DesignRollups) follow an issue that changed by
+removing its old version and adding the new one.
+"""
+from collections import defaultdict
+
+DESIGN_FIELDS = ('project', 'status', 'priority', 'type', 'assignee')
+
+
+def status_category_done(issue):
+    return issue.get('statusCategory') in ('Done', 'done')
+
+
+def _decrement(counts, value):
+    counts[value] -= 1
+    if not counts[value]:
+        del counts[value]
+
+
+class Breakdowns:
+    """Counts per value of each tracked field, and done/open per `group_by`."""
+
+    def __init__(self, fields=DESIGN_FIELDS, group_by='project', is_done=status_category_done):
+        self.fields = tuple(fields)
+        if group_by and group_by not in self.fields:
+            self.fields += (group_by,)
+        self.group_by = group_by
+        self.is_done = is_done
+        self.total = 0
+        self.counts = {f: defaultdict(int) for f in self.fields}
+        self.done = defaultdict(int)
+
+    def add(self, issue):
+        self.total += 1
+        for f in self.fields:
+            self.counts[f][issue.get(f, '')] += 1
+        if self.group_by and self.is_done(issue):
+            self.done[issue.get(self.group_by, '')] += 1
+        return issue
+
+    def remove(self, issue):
+        """Take back an earlier add(issue); counts that reach zero are dropped."""
+        self.total -= 1
+        for f in self.fields:
+            _decrement(self.counts[f], issue.get(f, ''))
+        if self.group_by and self.is_done(issue):
+            _decrement(self.done, issue.get(self.group_by, ''))
+        return issue
+
+    def extend(self, issues):
+        for issue in issues:
+            self.add(issue)
+        return self
+
+    def merge(self, other):
+        self.total += other.total
+        for f in self.fields:
+            for v, n in other.counts[f].items():
+                self.counts[f][v] += n
+        for g, n in other.done.items():
+            self.done[g] += n
+        return self
+
+    def state(self):
+        """The counts as plain JSON-able dicts, for restore()."""
+        return {'total': self.total, 'counts': {f: dict(c) for f, c in self.counts.items()}, 'done': dict(self.done)}
+
+    def restore(self, state):
+        self.total = state['total']
+        for f in self.fields:
+            self.counts[f].update(state['counts'].get(f, {}))
+        self.done.update(state['done'])
+        return self
+
+    def by(self, field):
+        return dict(self.counts[field])
+
+    def done_open(self, group):
+        """(done, open) counts for one value of `group_by`."""
+        total = self.counts[self.group_by].get(group, 0)
+        done = self.done.get(group, 0)
+        return done, total - done
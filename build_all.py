@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Build every dashboard in one run, as a dependency graph of stages.
+
+Run one by one, the builders each load credentials their own way and fetch
+or parse their inputs separately. Here each input is produced once and
+handed to the stages that use it:
+
+    creds ─┬─ fetch-board ── design-board
+           └─ fetch-epics ── epics
+    sync ──── design-issues
+              productivity   (reads its own per-project dumps)
+              oce-ppt
+
+Fetch stages (credentials, the agent-tools cache sync, the JIRA queries)
+run one after another in this process. Render stages run in worker
+processes, at most --workers at a time, alongside the fetches still going;
+each is started as soon as its inputs are ready. On Linux workers are
+forked and inherit their inputs; elsewhere they are spawned and sent a
+pickled copy, since a child forked after requests has used the macOS
+system frameworks (HTTPS, proxy lookups) can crash. A stage's output goes
+to .dashboard-cache/logs/<stage>.log; one that fails skips the stages that
+depend on it, not the whole build. A per-stage timing table is printed at
+the end; render stages whose inputs and builder are unchanged since their
+last build skip rendering (buildstamps.py) and show as unchanged.
+
+Usage:
+    python3 build_all.py [--only STAGE ...] [--workers N] [--bucket quarter|sprint|week] [--force]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import runpy
+import sys
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from functools import partial
+from multiprocessing.connection import wait as mp_wait
+
+try:
+    import requests
+except ImportError:
+    sys.exit("ERROR: 'requests' not installed. Run: pip install requests")
+
+import build_design_board
+import buildstamps
+import build_epic_report
+import extract_design_issues
+from jira_auth import CONFIG_PATH, load_creds
+from jira_cache import STATE_DIR, load_latest
+from mapreduce import START_METHOD
+from periods import BUCKETS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(STATE_DIR, 'logs')
+
+
+class Stage:
+    """A node of the build graph: run(*results of deps), here or in a worker process."""
+
+    def __init__(self, name, run, deps=(), worker=False):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.worker = worker
+
+
+# ── Stage bodies ─────────────────────────────────────────────────────────
+# Module-level so they can be sent to spawned workers.
+def sync_cache():
+    return load_latest(extract_design_issues.BASE)
+
+
+def fetch_board(creds):
+    with requests.Session() as session:
+        return build_design_board.fetch_issues(creds, session)
+
+
+def fetch_epics(creds):
+    if not creds:
+        sys.exit(f'No JIRA credentials: set JIRA_USER and JIRA_API_TOKEN or configure {CONFIG_PATH}')
+    with requests.Session() as session:
+        return build_epic_report.fetch(creds, session)
+
+
+def design_issues(synced):
+    extract_design_issues.build(*synced)
+
+
+def run_script(script, *argv):
+    """Run a builder that works at import time, as if from the command line."""
+    path = os.path.join(HERE, script)
+    sys.argv = [path, *argv]
+    runpy.run_path(path, run_name='__main__')
+
+
+def build_stages(bucket):
+    """The build graph, each stage listed after the stages it depends on."""
+    return [
+        Stage('creds', load_creds),
+        Stage('sync', sync_cache),
+        Stage('fetch-board', fetch_board, ['creds']),
+        Stage('fetch-epics', fetch_epics, ['creds']),
+        Stage('design-issues', design_issues, ['sync'], worker=True),
+        Stage('design-board', build_design_board.build, ['fetch-board'], worker=True),
+        Stage('epics', build_epic_report.render, ['fetch-epics'], worker=True),
+        Stage('productivity', partial(run_script, 'build_productivity_report.py', '--bucket', bucket), worker=True),
+        Stage('oce-ppt', partial(run_script, 'create_oce_ppt.py'), worker=True),
+    ]
+
+
+def select(stages, names):
+    """The stages named, plus everything they depend on."""
+    by_name = {s.name: s for s in stages}
+    wanted = set()
+
+    def need(name):
+        if name not in wanted:
+            wanted.add(name)
+            for dep in by_name[name].deps:
+                need(dep)
+
+    for name in names:
+        need(name)
+    return [s for s in stages if s.name in wanted]
+
+
+# ── Running stages ───────────────────────────────────────────────────────
+def _call(stage, inputs):
+    """(ok, result, error) of stage.run(*inputs); tracebacks go to the stage's log."""
+    try:
+        return True, stage.run(*inputs), None
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return True, None, None
+        print(e.code, file=sys.stderr)
+        return False, None, str(e.code)
+    except Exception as e:
+        traceback.print_exc()
+        return False, None, f'{type(e).__name__}: {e}'
+
+
+def _log_path(stage):
+    return os.path.join(LOG_DIR, f'{stage.name}.log')
+
+
+def _in_main(stage, inputs):
+    with open(_log_path(stage), 'w') as log, redirect_stdout(log), redirect_stderr(log):
+        return _call(stage, inputs)
+
+
+def _in_worker(stage, inputs, conn):
+    start = time.perf_counter()
+    with open(_log_path(stage), 'w') as log:
+        sys.stdout = sys.stderr = log
+        ok, _, error = _call(stage, inputs)
+    # Render stages' results stay here; only whether they ran goes back
+    conn.send((ok, error, start, time.perf_counter() - start, bool(buildstamps.skipped)))
+    conn.close()
+
+
+def _collect(conn, proc, forked):
+    """(ok, error, start, seconds, unchanged) reported by a worker, or its exit code if it died."""
+    try:
+        ok, error, start, seconds, unchanged = conn.recv()
+    except EOFError:
+        ok, error, start, seconds, unchanged = False, None, forked, time.perf_counter() - forked, False
+    proc.join()
+    if not ok and error is None:
+        error = f'worker exited with code {proc.exitcode}'
+    return ok, error, start, seconds, unchanged
+
+
+def run_graph(stages, workers):
+    """Run stages as their inputs become ready; returns {name: (runs in, start, seconds, status)}.
+
+    Fetch stages run one at a time in this process, which stays single
+    threaded, so a forked worker can never inherit a lock some other thread
+    held. Before and after each of them, every render stage whose inputs
+    are ready is started.
+    """
+    seen = set()
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in seen]
+        if missing:
+            raise ValueError(f'stage {stage.name} is listed before its dependencies {missing}')
+        seen.add(stage.name)
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    ctx = mp.get_context(START_METHOD)
+    results, failed, report = {}, set(), {}
+    waiting = list(stages)
+    running = {}  # result pipe -> (stage, process, start time)
+    t0 = time.perf_counter()
+
+    def finish(stage, ok, result, error, start, seconds, unchanged=False):
+        if ok:
+            results[stage.name] = result
+        else:
+            failed.add(stage.name)
+        status = f'FAILED: {error}' if not ok else 'unchanged, skipped' if unchanged else 'ok'
+        report[stage.name] = ('worker' if stage.worker else 'main', start - t0, seconds, status)
+        print(f'  {stage.name:14s} {seconds:7.2f}s  {status}')
+
+    while waiting or running:
+        for stage in list(waiting):
+            if any(d in failed for d in stage.deps):
+                waiting.remove(stage)
+                failed.add(stage.name)
+                report[stage.name] = ('-', None, None, 'skipped')
+                print(f'  {stage.name:14s} skipped')
+            elif stage.worker and len(running) < workers and all(d in results for d in stage.deps):
+                waiting.remove(stage)
+                reader, writer = ctx.Pipe(duplex=False)
+                proc = ctx.Process(target=_in_worker, name=f'build-{stage.name}',
+                                   args=(stage, [results[d] for d in stage.deps], writer))
+                proc.start()
+                writer.close()
+                running[reader] = (stage, proc, time.perf_counter())
+
+        fetch = next((s for s in waiting if not s.worker and all(d in results for d in s.deps)), None)
+        if fetch is not None:
+            waiting.remove(fetch)
+            start = time.perf_counter()
+            ok, result, error = _in_main(fetch, [results[d] for d in fetch.deps])
+            finish(fetch, ok, result, error, start, time.perf_counter() - start)
+        for reader in mp_wait(list(running), timeout=0 if fetch is not None else None) if running else ():
+            stage, proc, forked = running.pop(reader)
+            ok, error, start, seconds, unchanged = _collect(reader, proc, forked)
+            finish(stage, ok, None, error, start, seconds, unchanged)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build every dashboard from one shared fetch.')
+    names = [s.name for s in build_stages(BUCKETS[0])]
+    parser.add_argument('--only', nargs='+', choices=names, metavar='STAGE',
+                        help=f'run only these stages and what they depend on ({", ".join(names)})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='render stages run at once (default: all cores)')
+    parser.add_argument('--bucket', choices=BUCKETS, default='quarter',
+                        help='productivity report period granularity (default: quarter)')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every artifact even if its inputs are unchanged')
+    args = parser.parse_args()
+    if args.force:
+        os.environ['DASHBOARD_FORCE'] = '1'
+
+    stages = build_stages(args.bucket)
+    if args.only:
+        stages = select(stages, args.only)
+    print(f'Building {len(stages)} stages, logs in {LOG_DIR}')
+    t0 = time.perf_counter()
+    report = run_graph(stages, max(1, args.workers))
+    wall = time.perf_counter() - t0
+
+    print(f"\n{'stage':14s} {'runs in':8s} {'start':>8s} {'time':>8s}  status")
+    for stage in stages:
+        kind, start, seconds, status = report[stage.name]
+        if seconds is None:
+            print(f'{stage.name:14s} {kind:8s} {"":>8s} {"":>8s}  {status}')
+        else:
+            print(f'{stage.name:14s} {kind:8s} {start:7.2f}s {seconds:7.2f}s  {status}')
+    busy = sum(r[2] for r in report.values() if r[2] is not None)
+    print(f'\nWall time {wall:.2f}s for {busy:.2f}s of stage time')
+    if any(r[3].startswith(('FAILED', 'skipped')) for r in report.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
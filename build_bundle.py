@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Build a self-contained offline bundle of the dashboards.
+
+Copies every page (*.html next to this script) with its assets into dist/
+so the bundle opens straight from disk, or from any static server, with no
+network access:
+
+- CDN scripts (Chart.js) are vendored: fetched once into vendor/ and
+  loaded from there.
+- Runs of CSS rules that several pages repeat in their <style> blocks
+  move to shared, content-hashed stylesheets in assets/ (see share_css).
+- Pages, their inline CSS and JS, styles.css and script.js are minified
+  (minify.py).
+- The current data files and manifest are copied to data/, each with a
+  `.js` twin the pages' loader reads when opened from file:// (datafiles.py).
+- Every file gets a precompressed `.gz` sibling (nginx gzip_static).
+
+The bundle is built beside the target and swapped in at the end, so an
+old bundle stays usable until the new one is complete.
+
+Usage:
+    python3 build_bundle.py [--out DIR]
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import urllib.request
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from datafiles import DATA_DIR, MANIFEST, read_manifest
+from minify import css_units, minify_css, minify_html, minify_js
+from output import write_atomic
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DIST = os.path.join(HERE, 'dist')
+VENDOR_DIR = 'vendor'
+ASSET_DIR = 'assets'
+ASSETS = ('styles.css', 'script.js')
+
+CDN_SCRIPT = re.compile(r'<script src="(https://cdn\.jsdelivr\.net/npm/([^"@/]+)@([^"/]+)/(?:[^"]*/)?([^"/]+))"></script>')
+STYLE = re.compile(r'<style>(.*?)</style>', re.S)
+SCRIPT = re.compile(r'<script>(.*?)</script>', re.S)
+MIN_SHARED = 512  # bytes; shared stylesheets smaller than this aren't worth a request
+
+
+def vendor(url, package, version, fname):
+    """Path (relative to the bundle) of a local copy of a CDN file, fetched once."""
+    rel = f'{VENDOR_DIR}/{package}-{version}/{fname}'
+    path = os.path.join(HERE, rel)
+    if not os.path.exists(path):
+        print(f'  vendoring {url}')
+        try:
+            with urllib.request.urlopen(url, timeout=60) as resp:
+                body = resp.read()
+        except OSError as e:
+            sys.exit(f'ERROR: could not fetch {url} ({e}). Download it to {path} and re-run.')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, body)
+    return rel
+
+
+def _find_run(rules, run, covered):
+    """Index of an occurrence of run in rules that overlaps no covered rule, or -1."""
+    k = len(run)
+    for i in range(len(rules) - k + 1):
+        if rules[i] == run[0] and tuple(rules[i:i + k]) == run and not any(covered[i:i + k]):
+            return i
+    return -1
+
+
+def share_css(sheets):
+    """Split each page's CSS into shared runs of rules and inline leftovers.
+
+    sheets maps page -> minified top-level rules in cascade order.
+    Candidate runs are the longest stretches of rules two pages have in
+    common; taken largest saving first, a run is shared by every page where
+    it still occurs uncovered. Runs stay where they were among the page's
+    rules, so the cascade is unchanged.
+
+    Returns page -> segments in order, each a tuple of rules (a shared
+    run) or a list (inline rules).
+    """
+    candidates = set()
+    for a, b in combinations(sorted(sheets), 2):
+        matcher = SequenceMatcher(None, sheets[a], sheets[b], autojunk=False)
+        for block in matcher.get_matching_blocks():
+            run = tuple(sheets[a][block.a:block.a + block.size])
+            if sum(map(len, run)) >= MIN_SHARED:
+                candidates.add(run)
+
+    covered = {page: [None] * len(rules) for page, rules in sheets.items()}
+    by_saving = sorted(candidates, key=lambda run: (-sum(map(len, run)), run))
+    for run in by_saving:
+        hits = {page: i for page, rules in sheets.items() if (i := _find_run(rules, run, covered[page])) >= 0}
+        if len(hits) < 2:
+            continue
+        for page, i in hits.items():
+            covered[page][i:i + len(run)] = [run] * len(run)
+
+    segments = {}
+    for page, rules in sheets.items():
+        segs = []
+        i = 0
+        while i < len(rules):
+            run = covered[page][i]
+            if run is not None:
+                segs.append(run)
+                i += len(run)
+                continue
+            if not segs or isinstance(segs[-1], tuple):
+                segs.append([])
+            segs[-1].append(rules[i])
+            i += 1
+        segments[page] = segs
+    return segments
+
+
+def bundle(out_dir):
+    pages = sorted(glob.glob(os.path.join(HERE, '*.html')))
+    files = {}  # bundle-relative path -> bytes
+    sources = {}
+
+    # Pages: vendor CDN scripts, minify inline JS, collect CSS for sharing
+    sheets = {}
+    for path in pages:
+        name = os.path.basename(path)
+        with open(path, encoding='utf-8') as f:
+            html = sources[name] = f.read()
+        html = CDN_SCRIPT.sub(lambda m: f'<script src="{vendor(*m.groups())}"></script>', html)
+        html = SCRIPT.sub(lambda m: f'<script>{minify_js(m.group(1))}</script>', html)
+        styles = STYLE.findall(html)
+        if len(styles) == 1:
+            sheets[name] = css_units(minify_css(styles[0]))
+        else:
+            html = STYLE.sub(lambda m: f'<style>{minify_css(m.group(1))}</style>', html)
+        files[name] = html
+
+    for name, segments in share_css(sheets).items():
+        css = []
+        for seg in segments:
+            if isinstance(seg, tuple):
+                body = ''.join(seg).encode('utf-8')
+                href = f'{ASSET_DIR}/{hashlib.sha256(body).hexdigest()[:12]}.css'
+                files[href] = body
+                css.append(f'<link rel="stylesheet" href="{href}">')
+            else:
+                css.append(f'<style>{"".join(seg)}</style>')
+        files[name] = STYLE.sub(lambda m: ''.join(css), files[name], count=1)
+
+    for name in sources:
+        files[name] = minify_html(files[name])
+
+    for name in ASSETS:
+        with open(os.path.join(HERE, name), encoding='utf-8') as f:
+            files[name] = (minify_css if name.endswith('.css') else minify_js)(f.read())
+
+    # Current data files, each with a script twin for file:// (LOADER_JS)
+    manifest = read_manifest(HERE)
+    for fname in [MANIFEST] + sorted(manifest.values()):
+        rel = f'{DATA_DIR}/{fname}'
+        with open(os.path.join(HERE, DATA_DIR, fname), 'rb') as f:
+            body = f.read()
+        files[rel] = body
+        files[rel + '.js'] = b'dashboardData(' + json.dumps(rel).encode('utf-8') + b',' + body.strip() + b');\n'
+
+    for rel in {m.group(0) for m in re.finditer(rf'{VENDOR_DIR}/[^"]+', ''.join(files[n] for n in sources))}:
+        with open(os.path.join(HERE, rel), 'rb') as f:
+            files[rel] = f.read()
+
+    # Write the bundle beside out_dir, then swap it in
+    tmp = out_dir + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    for rel, body in files.items():
+        if isinstance(body, str):
+            body = files[rel] = body.encode('utf-8')
+        path = os.path.join(tmp, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(body)
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(body, 9, mtime=0))
+    old = out_dir + '.old'
+    if os.path.exists(out_dir):
+        os.replace(out_dir, old)
+    os.replace(tmp, out_dir)
+    shutil.rmtree(old, ignore_errors=True)
+    return files, sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline dashboard bundle.')
+    parser.add_argument('--out', default=DIST, help=f'bundle directory (default: {DIST})')
+    args = parser.parse_args()
+
+    files, sources = bundle(os.path.abspath(args.out))
+
+    def gz(body):
+        return len(gzip.compress(body, 9, mtime=0))
+
+    print(f"{'file':34s} {'source':>9s} {'bundle':>9s} {'gzip':>9s}")
+    for rel in sorted(files):
+        src = sources.get(rel)
+        before = f'{len(src.encode("utf-8")):9,d}' if src is not None else f"{'':9s}"
+        print(f'{rel:34s} {before} {len(files[rel]):9,d} {gz(files[rel]):9,d}')
+    shipped = [rel for rel in files if rel in sources or rel.startswith(ASSET_DIR + '/')]
+    src_total = sum(len(src.encode('utf-8')) for src in sources.values())
+    print(f'\nPages + shared CSS: {src_total:,d} -> {sum(len(files[r]) for r in shipped):,d} bytes, '
+          f'{sum(gz(files[r]) for r in shipped):,d} gzipped')
+    print(f'Bundle written to: {args.out}')
+
+
+if __name__ == '__main__':
+    main()
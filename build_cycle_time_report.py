@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Cycle time, lead time and time-in-status percentiles from JIRA changelogs.
+
+Streams issues with `expand=changelog` one search page at a time, pulling
+the remaining changelog pages of any issue whose history was truncated, and
+folds each issue into a status-interval record as soon as its transitions
+are known. Records are appended to a JSON-lines file and added to
+per-(project, priority) histograms; raw histories are never kept, so memory
+stays bounded by one page plus the histograms.
+
+Usage:
+    python3 build_cycle_time_report.py [--projects CBP SENG ...] [--days 180]
+"""
+import argparse, json, os, sys, time
+
+try:
+    import requests
+except ImportError:
+    sys.exit("Install requests: pip3 install requests")
+
+from build_epic_report import PROJECTS
+from changelog import DurationStats, fold_issue, status_transitions
+from jira_auth import CONFIG_PATH, load_creds
+from output import atomic_output
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RECORDS_PATH = os.path.join(HERE, 'cycle-time-records.jsonl')
+OUTPUT_PATH = os.path.join(HERE, 'cycle-time.json')
+
+FIELDS = ['created', 'resolutiondate', 'status', 'priority', 'project']
+
+
+def status_categories(session, base_url):
+    """Status name -> category name for every status in the instance."""
+    resp = session.get(f'{base_url}/rest/api/3/status', timeout=30)
+    resp.raise_for_status()
+    return {s['name']: (s.get('statusCategory') or {}).get('name', '') for s in resp.json()}
+
+
+def search_pages(session, base_url, jql, page_size=50):
+    """Yield one page of issues (with changelog) at a time."""
+    next_token = None
+    while True:
+        body = {'jql': jql, 'fields': FIELDS, 'expand': 'changelog', 'maxResults': page_size}
+        if next_token:
+            body['nextPageToken'] = next_token
+        resp = session.post(f'{base_url}/rest/api/3/search/jql', json=body, timeout=60)
+        resp.raise_for_status()
+        data = resp.json()
+        issues = data.get('issues', [])
+        if issues:
+            yield issues
+        next_token = data.get('nextPageToken')
+        if data.get('isLast', True) or not issues or not next_token:
+            break
+        time.sleep(0.2)
+
+
+def changelog_pages(session, base_url, key, start_at, page_size=100):
+    """Yield the histories of `key` from `start_at` on, one page at a time."""
+    while True:
+        resp = session.get(f'{base_url}/rest/api/3/issue/{key}/changelog',
+                           params={'startAt': start_at, 'maxResults': page_size}, timeout=30)
+        resp.raise_for_status()
+        data = resp.json()
+        values = data.get('values', [])
+        if values:
+            yield values
+        start_at += len(values)
+        if data.get('isLast', True) or not values:
+            break
+
+
+def issue_transitions(session, base_url, raw):
+    changelog = raw.get('changelog') or {}
+    histories = changelog.get('histories', [])
+    transitions = status_transitions(histories)
+    if changelog.get('total', 0) > len(histories):
+        # Search embeds only the first page of a long history
+        for page in changelog_pages(session, base_url, raw['key'], len(histories)):
+            transitions.extend(status_transitions(page))
+        transitions.sort(key=lambda t: t[0])
+    return transitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cycle-time and time-in-status percentiles from JIRA changelogs.')
+    parser.add_argument('--projects', nargs='+', default=PROJECTS)
+    parser.add_argument('--days', type=int, default=180, help='issues updated in the last N days (default: 180)')
+    args = parser.parse_args()
+
+    creds = load_creds()
+    if not creds:
+        sys.exit(f"No JIRA credentials: set JIRA_USER and JIRA_API_TOKEN or configure {CONFIG_PATH}")
+    base_url, username, token = creds
+    session = requests.Session()
+    session.auth = (username, token)
+    print(f"Connecting to {base_url} as {username}...")
+
+    categories = status_categories(session, base_url)
+    stats = DurationStats()
+    n = 0
+    with atomic_output(RECORDS_PATH) as out:
+        for proj in args.projects:
+            jql = f'project = {proj} AND issuetype != Epic AND updated >= -{args.days}d ORDER BY key ASC'
+            for page in search_pages(session, base_url, jql):
+                for raw in page:
+                    record = fold_issue(raw, issue_transitions(session, base_url, raw), categories)
+                    stats.add(record)
+                    out.write(json.dumps(record, separators=(',', ':')) + '\n')
+                    n += 1
+            print(f"  {proj}: {n} issues folded so far")
+
+    percentiles = stats.percentiles()
+    with atomic_output(OUTPUT_PATH) as f:
+        json.dump({'days': args.days, 'issues': n, 'percentiles': percentiles}, f, indent=2)
+
+    print(f"\n{'Project':10s} {'Priority':16s} {'n':>6s} {'cycle p50':>10s} {'p90':>8s} {'p99':>8s}  (hours)")
+    for proj, by_priority in percentiles.items():
+        for priority, metrics in by_priority.items():
+            c = metrics.get('cycle_hours')
+            if c:
+                print(f"{proj:10s} {priority:16s} {c['n']:6d} {c['p50']:10.1f} {c['p90']:8.1f} {c['p99']:8.1f}")
+    print(f"\nRecords written to: {RECORDS_PATH}")
+    print(f"Percentiles written to: {OUTPUT_PATH}")
+
+
+if __name__ == '__main__':
+    main()
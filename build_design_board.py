@@ -1,23 +1,28 @@
 #!/usr/bin/env python3
 """
 Fetch all JIRA issues labeled 'design' created in 2026 across all projects,
-then regenerate design-board.html with the live data injected.
+then write them to the board's data file (data/design-board.<hash>.json,
+see datafiles.py). design-board.html itself is a static shell that loads it;
+each build splices the shared decoder, search and loader JS (the same
+constants the other builders embed) into it, so its copies never drift.
 
 Usage:
-    python3 build_design_board.py
+    python3 build_design_board.py [--inline]
+
+    --inline  splice the data into design-board.html instead, so the board
+              works when opened straight from disk
 
 Requires:
     pip install requests
 
-Environment variables:
-    JIRA_URL        — Base URL (default: https://blendlabs.atlassian.net)
-    JIRA_USER       — Email for basic auth
-    JIRA_API_TOKEN  — API token (https://id.atlassian.com/manage-profile/security/api-tokens)
+Credentials: JIRA_URL / JIRA_USER / JIRA_API_TOKEN, or ~/.cursor/mcp.json
+(see jira_auth.py).
 """
 
+import argparse
+import base64
 import json
 import os
-import re
 import sys
 from datetime import datetime
 
@@ -26,28 +31,54 @@ try:
 except ImportError:
     sys.exit("ERROR: 'requests' not installed. Run: pip install requests")
 
-JIRA_URL = os.environ.get("JIRA_URL", "https://blendlabs.atlassian.net")
-JIRA_USER = os.environ.get("JIRA_USER", "")
-JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN", "")
+from breakdowns import Breakdowns
+from buildstamps import BuildStamp
+from columnar import COLUMNAR_JS, encode
+from datafiles import LOADER_JS, write_data
+from jira_auth import load_creds
+from output import atomic_output, write_atomic
+from search_index import SEARCH_JS, SearchIndex
 
 JQL = 'labels = design AND created >= "2026-01-01" ORDER BY priority ASC, updated DESC'
-FIELDS = "summary,status,assignee,priority,issuetype,labels,project,updated,created"
+FIELDS = "summary,status,assignee,priority,issuetype,labels,project,updated,created,parent"
 MAX_RESULTS = 100
 
+# Board data columns (columnar.py); all but key and summary are dictionary-encoded
+COLUMNS = ("key", "project", "type", "summary", "priority", "status", "statusCategory",
+           "assignee", "labels", "updated", "parent")
+CATEGORICAL = ("project", "type", "priority", "status", "statusCategory", "assignee",
+               "labels", "updated", "parent")
+
+# Board columns, in display order; issues in any other category show under backlog
+BOARD_COLUMNS = ("backlog", "todo", "in_progress", "review", "done")
+
 HTML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "design-board.html")
+DATA_START = "let ISSUES = "
 MARKER = "/* %%ISSUE_DATA%% */"
+LIBRARY_START = "/* %%LIBRARY_JS%%"
+LIBRARY_END = "/* %%END_LIBRARY_JS%% */"
+LIBRARY_JS = "\n\n".join([COLUMNAR_JS, SEARCH_JS, LOADER_JS])
 
+# Code that shapes the board's data; a change to any of them rebuilds it (buildstamps.py)
+SOURCES = ("build_design_board.py", "breakdowns.py", "columnar.py", "search_index.py", "datafiles.py", "output.py")
 
-def fetch_issues():
-    """Fetch all design-labeled issues from JIRA using REST API."""
-    if not JIRA_USER or not JIRA_API_TOKEN:
-        print("WARNING: JIRA_USER and JIRA_API_TOKEN not set.")
+
+def fetch_issues(creds, session=None):
+    """Fetch all design-labeled issues from JIRA using REST API.
+
+    creds is jira_auth.load_creds()'s (url, user, token); session, if
+    given, is a requests.Session reused across the pages.
+    """
+    if not creds:
+        print("WARNING: no JIRA credentials found.")
         print("Set them as environment variables to fetch live data.")
         print("  export JIRA_USER='you@example.com'")
         print("  export JIRA_API_TOKEN='your-token'")
         return []
 
-    auth = (JIRA_USER, JIRA_API_TOKEN)
+    jira_url, user, token = creds
+    auth = (user, token)
+    session = session or requests
     headers = {"Accept": "application/json"}
     all_issues = []
     start_at = 0
@@ -59,8 +90,8 @@ def fetch_issues():
             "maxResults": MAX_RESULTS,
             "startAt": start_at,
         }
-        resp = requests.get(
-            f"{JIRA_URL}/rest/api/3/search",
+        resp = session.get(
+            f"{jira_url}/rest/api/3/search",
             headers=headers,
             auth=auth,
             params=params,
@@ -87,6 +118,7 @@ def fetch_issues():
             issue_type = (fields.get("issuetype") or {}).get("name", "Task")
             project_key = (fields.get("project") or {}).get("key", "")
             labels = fields.get("labels", [])
+            parent = ((fields.get("parent") or {}).get("fields") or {}).get("summary", "")
 
             updated = fields.get("updated", "")
             if updated:
@@ -111,6 +143,7 @@ def fetch_issues():
                     "assignee": assignee.replace("'", "\\'"),
                     "labels": labels,
                     "updated": updated,
+                    "parent": parent,
                 }
             )
 
@@ -148,56 +181,165 @@ def categorize_status(status, jira_category=""):
     return "backlog"
 
 
+def prio_key(priority):
+    """The board's P0..P4 bucket for a JIRA priority name (prioKey in design-board.html)."""
+    s = (priority or "").lower()
+    if "block" in s or "p0" in s or "highest" in s:
+        return "P0"
+    if "critical" in s or "p1" in s or "high" in s:
+        return "P1"
+    if "major" in s or "p2" in s or "medium" in s:
+        return "P2"
+    if "minor" in s or "p3" in s or "low" in s:
+        return "P3"
+    return "P4"
+
+
+def facet_bitsets(issues):
+    """Bitsets of the issues having each value of each board filter facet.
+
+    Facets are project, type, priority (P0..P4) and board column. Bit i
+    stands for issue i; each bitset is `words` little-endian 32-bit words,
+    base64 encoded, for the page to AND together.
+    """
+    masks = {"project": {}, "type": {}, "priority": {}, "column": {}}
+    for i, issue in enumerate(issues):
+        cat = issue.get("statusCategory") or categorize_status(issue.get("status", ""))
+        facets = (
+            ("project", issue.get("project", "")),
+            ("type", issue.get("type") or "Task"),
+            ("priority", prio_key(issue.get("priority"))),
+            ("column", cat if cat in BOARD_COLUMNS else "backlog"),
+        )
+        bit = 1 << i
+        for dim, value in facets:
+            masks[dim][value] = masks[dim].get(value, 0) | bit
+
+    words = (len(issues) + 31) // 32
+    facets = {"words": words}
+    for dim, by_value in masks.items():
+        facets[dim] = {value: base64.b64encode(mask.to_bytes(4 * words, "little")).decode("ascii")
+                       for value, mask in sorted(by_value.items())}
+    return facets
+
+
+def inject_scripts():
+    """Splice LIBRARY_JS between the LIBRARY markers of design-board.html.
+
+    The page is only rewritten when its copy differs, so an unchanged shell
+    keeps its mtime and browser cache. Returns True if it was rewritten.
+    """
+    if not os.path.exists(HTML_PATH):
+        sys.exit(f"ERROR: {HTML_PATH} not found. Ensure design-board.html exists.")
+    with open(HTML_PATH, "r", encoding="utf-8") as f:
+        page = f.read()
+    start = page.find(LIBRARY_START)
+    end = page.find(LIBRARY_END, start)
+    if start < 0 or end < 0:
+        sys.exit("ERROR: Could not find LIBRARY_JS markers in design-board.html")
+    start = page.index("\n", start) + 1  # keep the marker line
+    if page[start:end] == LIBRARY_JS + "\n":
+        return False
+    write_atomic(HTML_PATH, page[:start] + LIBRARY_JS + "\n" + page[end:])
+    return True
+
+
 def inject_data(issues):
-    """Replace the ISSUE_DATA marker in design-board.html with real data."""
+    """Splice real data into the ISSUES region of design-board.html.
+
+    The region runs from the line starting with DATA_START to the MARKER
+    line. The file is copied line by line with the region replaced through
+    output.atomic_output, so a failed run never leaves a half-written board.
+    """
     if not os.path.exists(HTML_PATH):
         sys.exit(f"ERROR: {HTML_PATH} not found. Ensure design-board.html exists.")
 
-    with open(HTML_PATH, "r") as f:
-        html = f.read()
+    payload = json.dumps(board_data(issues), ensure_ascii=False)
+
+    state = "prefix"
+    with open(HTML_PATH, "r", encoding="utf-8") as src, atomic_output(HTML_PATH) as out:
+        for line in src:
+            if state == "prefix" and line.startswith(DATA_START):
+                state = "data"
+            if state == "data":
+                # Old payload lines are dropped until the closing marker
+                at = line.find(MARKER)
+                if at < 0:
+                    continue
+                out.write(f"{DATA_START}{payload};\n")
+                out.write(line[at:])
+                state = "suffix"
+                continue
+            out.write(line)
+        if state != "suffix":
+            # Leaving the block by exception discards the temp file
+            sys.exit("ERROR: Could not find ISSUE_DATA marker in design-board.html")
 
-    js_array = json.dumps(issues, ensure_ascii=False)
+    return len(issues)
 
-    old_pattern = r"const ISSUES = \[.*?\];\s*/\* %%ISSUE_DATA%% \*/"
-    replacement = f"const ISSUES = {js_array};\n{MARKER}"
 
-    new_html, count = re.subn(old_pattern, replacement, html, flags=re.DOTALL)
-    if count == 0:
-        sys.exit("ERROR: Could not find ISSUE_DATA marker in design-board.html")
+def board_data(issues):
+    """The board's ISSUES payload: the issues as columns, plus their facet bitsets."""
+    payload = encode(issues, COLUMNS, CATEGORICAL)
+    payload["facets"] = facet_bitsets(issues)
+    return payload
 
-    with open(HTML_PATH, "w") as f:
-        f.write(new_html)
 
-    return len(issues)
+def search_index(issues):
+    """SearchIndex over the board's issues by key, summary, assignee and parent summary."""
+    index = SearchIndex()
+    for issue in issues:
+        index.add(issue["key"], issue["summary"], issue["assignee"], issue.get("parent", ""))
+    return index
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Build the design board data from JIRA.")
+    parser.add_argument("--inline", action="store_true",
+                        help="splice the data into design-board.html instead of writing data/")
+    args = parser.parse_args()
+
     print(f"Design Board Builder")
     print(f"  JQL: {JQL}")
     print(f"  Target: {HTML_PATH}")
     print()
 
-    issues = fetch_issues()
+    with requests.Session() as session:
+        build(fetch_issues(load_creds(), session), args.inline)
+
 
+def build(issues, inline=False):
+    """Write the board's data files (or splice them into the page) and print a summary."""
     if not issues:
         print("No issues fetched. Board will show empty state.")
         print("To populate with live data, set JIRA_USER and JIRA_API_TOKEN.")
         return
 
-    count = inject_data(issues)
-    projects = sorted(set(i["project"] for i in issues))
-
-    print(f"SUCCESS: Injected {count} issues into design-board.html")
-    print(f"  Projects: {', '.join(projects)}")
-    print(f"  Statuses: {dict_summary(issues, 'statusCategory')}")
-    print(f"  Types:    {dict_summary(issues, 'type')}")
-
+    stamp = BuildStamp("design-board-inline" if inline else "design-board", SOURCES).input("issues", issues)
+    if stamp.fresh():
+        print(stamp.skip_message())
+        return
 
-def dict_summary(issues, key):
-    counts = {}
-    for i in issues:
-        v = i.get(key, "unknown")
-        counts[v] = counts.get(v, 0) + 1
+    if inject_scripts():
+        print(f"Updated the shared scripts in {os.path.basename(HTML_PATH)}")
+    if inline:
+        inject_data(issues)
+        target = os.path.basename(HTML_PATH)
+        stamp.save([HTML_PATH])
+    else:
+        page_dir = os.path.dirname(HTML_PATH)
+        target = write_data(page_dir, "design-board", board_data(issues))
+        search = write_data(page_dir, "design-board-search", search_index(issues).to_dict(target))
+        stamp.save([os.path.join(page_dir, target), os.path.join(page_dir, search)])
+    summary = Breakdowns(fields=("project", "statusCategory", "type"), group_by=None).extend(issues)
+
+    print(f"SUCCESS: Wrote {len(issues)} issues to {target}")
+    print(f"  Projects: {', '.join(sorted(summary.by('project')))}")
+    print(f"  Statuses: {dict_summary(summary.by('statusCategory'))}")
+    print(f"  Types:    {dict_summary(summary.by('type'))}")
+
+
+def dict_summary(counts):
     return ", ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
 
 
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Skip rebuilding artifacts whose inputs have not changed.
+
+Each generated artifact (a report page and its data files, the design
+board's data, the OCE deck) keeps a stamp under .dashboard-cache/stamps:
+digests of the inputs it was built from, a digest of the builder's source
+files (its version), and the size and mtime of every file it wrote. A
+builder hashes its inputs first; when they, its sources and its outputs all
+match the stamp it skips rendering and writing altogether, so an unchanged
+run costs the hashing and leaves the files, their mtimes and browser caches
+alone.
+
+    stamp = BuildStamp('epics', EPIC_SOURCES).input('data', data)
+    if stamp.fresh():
+        print(stamp.skip_message())
+        return
+    ...render and write...
+    stamp.save([OUTPUT_PATH, data_path])
+
+Set DASHBOARD_FORCE=1 to rebuild regardless (build_all.py --force).
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from jira_cache import STATE_DIR
+from output import write_atomic
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STAMP_DIR = os.path.join(STATE_DIR, 'stamps')
+STAMP_VERSION = 1
+
+skipped = []  # artifacts found fresh in this process, for build_all's report
+
+
+def digest(value):
+    """sha256 of a JSON-able value, independent of dict order."""
+    body = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def source_digest(names):
+    """sha256 over the source files named, relative to this directory."""
+    h = hashlib.sha256()
+    for name in names:
+        with open(os.path.join(HERE, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _fingerprint(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class BuildStamp:
+    """What one artifact was last built from, and the files that build wrote."""
+
+    def __init__(self, artifact, sources, root=STAMP_DIR):
+        self.artifact = artifact
+        self.path = os.path.join(root, f'{artifact}.json')
+        self.sources = source_digest(sources)
+        self.inputs = {}  # input name -> digest
+        self.previous = None
+        try:
+            with open(self.path) as f:
+                prev = json.load(f)
+            if prev.get('version') == STAMP_VERSION:
+                self.previous = prev
+        except (OSError, ValueError):
+            pass
+
+    def input(self, name, value):
+        self.inputs[name] = digest(value)
+        return self
+
+    def changes(self):
+        """Why the artifact needs building: changed input names, 'builder' and/or 'outputs'."""
+        prev = self.previous
+        if prev is None:
+            return ['no previous build']
+        changed = [n for n in sorted(set(self.inputs) | set(prev['inputs']))
+                   if self.inputs.get(n) != prev['inputs'].get(n)]
+        if self.sources != prev['sources']:
+            changed.append('builder')
+        for path, fp in prev['outputs'].items():
+            try:
+                same = _fingerprint(path) == fp
+            except OSError:
+                same = False
+            if not same:
+                changed.append('outputs')
+                break
+        return changed
+
+    def fresh(self):
+        """True when inputs, builder and outputs all match the last build."""
+        if os.environ.get('DASHBOARD_FORCE') == '1' or self.changes():
+            return False
+        skipped.append(self.artifact)
+        return True
+
+    def skip_message(self):
+        return f'{self.artifact}: inputs and builder unchanged since {self.previous["built"]}, skipped'
+
+    def save(self, outputs):
+        """Record this build's digests and the outputs it wrote."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_atomic(self.path, json.dumps({
+            'version': STAMP_VERSION,
+            'artifact': self.artifact,
+            'built': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sources': self.sources,
+            'inputs': self.inputs,
+            'outputs': {os.path.abspath(p): _fingerprint(p) for p in outputs},
+        }, indent=1))
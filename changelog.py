@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Fold JIRA changelogs into status intervals and streaming duration stats.
+
+Issue histories are large, so nothing here holds more than one issue's
+status transitions at a time: `fold_issue` turns an issue with its
+changelog into a compact record (status intervals, cycle time, lead time),
+and DurationStats adds those records to per-(project, priority)
+LogHistograms. A LogHistogram keeps counts in logarithmic buckets (each
+about 2% wide), so p50/p90/p99 come from a few hundred integers per group
+no matter how many issues were streamed through it.
+"""
+import math
+from datetime import datetime, timezone
+
+HOUR = 3600.0
+
+
+def parse_ts(value):
+    """Epoch seconds of a JIRA timestamp, or None."""
+    if not value:
+        return None
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z'):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class LogHistogram:
+    """Fixed-relative-error histogram of positive durations."""
+
+    def __init__(self, growth=1.02):
+        self.growth = growth
+        self.log_growth = math.log(growth)
+        self.counts = {}
+        self.total = 0
+        self.zeros = 0
+
+    def add(self, value, n=1):
+        self.total += n
+        if value <= 0:
+            self.zeros += n
+            return
+        b = math.floor(math.log(value) / self.log_growth)
+        self.counts[b] = self.counts.get(b, 0) + n
+
+    def merge(self, other):
+        self.total += other.total
+        self.zeros += other.zeros
+        for b, n in other.counts.items():
+            self.counts[b] = self.counts.get(b, 0) + n
+        return self
+
+    def quantile(self, q):
+        """Value at quantile q (0..1), accurate to the bucket width."""
+        if not self.total:
+            return None
+        rank = q * (self.total - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if rank < seen:
+                return self.growth ** (b + 0.5)  # bucket midpoint (geometric)
+        return self.growth ** (max(self.counts) + 0.5)
+
+    def to_dict(self):
+        return {'growth': self.growth, 'zeros': self.zeros,
+                'counts': {str(b): n for b, n in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        h = cls(data.get('growth', 1.02))
+        h.zeros = data.get('zeros', 0)
+        h.counts = {int(b): n for b, n in data.get('counts', {}).items()}
+        h.total = h.zeros + sum(h.counts.values())
+        return h
+
+
+def status_transitions(histories):
+    """[(ts, from status, to status)] from changelog histories, oldest first."""
+    out = []
+    for h in histories:
+        ts = None
+        for item in h.get('items', ()):
+            if item.get('field') != 'status':
+                continue
+            if ts is None:
+                ts = parse_ts(h.get('created'))
+                if ts is None:
+                    break
+            out.append((ts, item.get('fromString') or '', item.get('toString') or ''))
+    out.sort(key=lambda t: t[0])
+    return out
+
+
+def fold_issue(raw, transitions, categories, now=None):
+    """Compact record for one issue: intervals and cycle/lead times in hours.
+
+    `transitions` comes from status_transitions (all of the issue's pages);
+    `categories` maps status name -> category name ('To Do', 'In Progress',
+    'Done'), as returned by the JIRA status endpoint.
+    """
+    f = raw.get('fields', {}) or {}
+    status = f.get('status') or {}
+    created = parse_ts(f.get('created'))
+    resolved = parse_ts(f.get('resolutiondate'))
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+
+    intervals = []
+    current = transitions[0][1] if transitions else status.get('name', '')
+    start = created
+    started = last_done = None
+    for ts, _, to in transitions:
+        if start is not None:
+            intervals.append((current, start, ts))
+        cat = categories.get(to)
+        if cat == 'In Progress' and started is None:
+            started = ts
+        elif cat == 'Done':
+            last_done = ts
+        current, start = to, ts
+
+    done = categories.get(current) == 'Done'
+    done_at = (resolved or last_done) if done else None
+    if start is not None:
+        end = done_at if done and done_at else now
+        intervals.append((current, start, max(end, start)))
+
+    return {
+        'key': raw.get('key', ''),
+        'project': (f.get('project') or {}).get('key') or raw.get('key', '').split('-')[0],
+        'priority': (f.get('priority') or {}).get('name', '') or 'None',
+        'status': status.get('name', ''),
+        'intervals': [[s, round(a), round(b)] for s, a, b in intervals],
+        'lead_hours': (done_at - created) / HOUR if done_at and created else None,
+        'cycle_hours': (done_at - started) / HOUR if done_at and started else None,
+    }
+
+
+class DurationStats:
+    """Per-(project, priority) histograms of cycle, lead and time-in-status."""
+
+    def __init__(self):
+        self.groups = {}  # (project, priority) -> {metric: LogHistogram}
+
+    def _hist(self, group, metric):
+        metrics = self.groups.get(group)
+        if metrics is None:
+            metrics = self.groups[group] = {}
+        h = metrics.get(metric)
+        if h is None:
+            h = metrics[metric] = LogHistogram()
+        return h
+
+    def add(self, record):
+        group = (record['project'], record['priority'])
+        for metric in ('cycle_hours', 'lead_hours'):
+            if record[metric] is not None:
+                self._hist(group, metric).add(record[metric])
+        per_status = {}
+        for status, start, end in record['intervals']:
+            per_status[status] = per_status.get(status, 0) + (end - start)
+        for status, seconds in per_status.items():
+            self._hist(group, f'status:{status}').add(seconds / HOUR)
+
+    def merge(self, other):
+        for group, metrics in other.groups.items():
+            for metric, h in metrics.items():
+                self._hist(group, metric).merge(h)
+        return self
+
+    def percentiles(self, qs=(0.5, 0.9, 0.99)):
+        """{project: {priority: {metric: {'n', 'p50', 'p90', 'p99'}}}} in hours."""
+        out = {}
+        for (project, priority), metrics in sorted(self.groups.items()):
+            row = out.setdefault(project, {}).setdefault(priority, {})
+            for metric, h in sorted(metrics.items()):
+                cell = {'n': h.total}
+                for q in qs:
+                    v = h.quantile(q)
+                    cell[f'p{round(q * 100)}'] = round(v, 1) if v is not None else None
+                row[metric] = cell
+        return out
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Declarative issue classifiers evaluated together in one pass per issue.
+
+Each classifier is plain data: a tag name plus any of key prefixes, labels,
+summary rules, parent-summary rules, exclude rules and required issue types.
+An issue gets a classifier's tag when it is not excluded, its type is allowed
+(if `types` is given) and at least one of the prefix / label / summary /
+parent criteria matches (a classifier with no such criteria matches on type
+alone). RuleEngine compiles every classifier up front — prefixes, labels and
+types become tag-bit lookup tables, pattern rules become one named-group
+regex per classifier — and returns a bitmask of tags per issue, so adding a
+classifier does not add another scan of the cache. On request it also names
+the rule that set each tag.
+
+Rules are (name, pattern, flags) tuples, the format compile_rules expects.
+"""
+import hashlib
+import json
+import re
+
+# ── Design ──────────────────────────────────────────────────────────────
+DESIGN_PROJECTS = {'DDB', 'PRDS'}
+DESIGN_LABELS = {'design', 'ux', 'ui-design', 'design-review', 'design-needed', 'ui', 'ux-design'}
+
+DESIGN_SUMMARY_RULES = [
+    ('design_prefix', r'^DESIGN\s*[-:]', re.IGNORECASE),
+    ('design_word', r'\bdesign\b', re.IGNORECASE),
+    ('redesign', r'\bredesign\b', re.IGNORECASE),
+    ('figma', r'\bfigma\b', re.IGNORECASE),
+    ('ux', r'\bUX\b', 0),
+    ('ui_changes', r'\bUI changes\b', re.IGNORECASE),
+]
+
+EXCLUDE_RULES = [
+    ('exclude_disclosures', r'updateDisclosuresPackages', re.IGNORECASE),
+    ('exclude_remove_ff', r'Remove FF:', re.IGNORECASE),
+]
+
+PARENT_RULES = [
+    ('parent_design', r'\bdesign\b', re.IGNORECASE),
+]
+
+# ── OCE / EPD / production defects (labels as listed on oce-dashboard.html) ──
+OCE_LABELS = {'oce', 'epd-logged', 'on-call-form', 'customer-qa', 'documents-and-delivery-oncall'}
+EPD_LABELS = {'epd-logged'}
+DEFECT_PROJECTS = {'DDINDIA', 'CLN', 'SENG', 'IMB', 'CBP'}
+
+CLASSIFIERS = [
+    {
+        'tag': 'design',
+        'key_prefixes': DESIGN_PROJECTS,
+        'labels': DESIGN_LABELS,
+        'summary': DESIGN_SUMMARY_RULES,
+        'parent': PARENT_RULES,
+        'exclude': EXCLUDE_RULES,
+    },
+    {
+        'tag': 'oce',
+        'labels': OCE_LABELS,
+        'summary': [('oce_word', r'\bOCE\b', 0), ('on_call', r'\bon[- ]call\b', re.IGNORECASE)],
+    },
+    {
+        'tag': 'epd',
+        'labels': EPD_LABELS,
+        'summary': [('epd_logged', r'\bEPD[- ]logged\b', re.IGNORECASE)],
+    },
+    {
+        'tag': 'production_defect',
+        'types': {'bug'},
+        'key_prefixes': DEFECT_PROJECTS,
+        'labels': {'production', 'prod-defect', 'production-defect'},
+    },
+]
+
+
+def compile_rules(rules):
+    """Combine (name, pattern, flags) rules into one regex of named groups.
+
+    The combined regex is case-insensitive; case-sensitive rules are scoped
+    with (?-i:...). Rules wrapped in \\b...\\b share a single word-boundary
+    group so the boundary is tested once per position rather than per rule.
+    """
+    bounded, other = [], []
+    for name, pattern, flags in rules:
+        wb = pattern.startswith(r'\b') and pattern.endswith(r'\b')
+        if wb:
+            pattern = pattern[2:-2]
+        if not flags & re.IGNORECASE:
+            pattern = f'(?-i:{pattern})'
+        (bounded if wb else other).append(f'(?P<{name}>{pattern})')
+    parts = list(other)
+    if bounded:
+        parts.append(r'\b(?:' + '|'.join(bounded) + r')\b')
+    return re.compile('|'.join(parts), re.IGNORECASE)
+
+
+def issue_type(raw):
+    itype = raw.get('issuetype') or raw.get('type') or ''
+    if isinstance(itype, dict):
+        itype = itype.get('name', '')
+    return itype
+
+
+class RuleEngine:
+    """Compiled form of a list of classifier specs."""
+
+    def __init__(self, specs=CLASSIFIERS):
+        if len(specs) > 62:
+            raise ValueError('too many classifiers for one tag mask')
+        self.tags = [s['tag'] for s in specs]
+        self.bits = {tag: 1 << i for i, tag in enumerate(self.tags)}
+        self.tag_of = {bit: tag for tag, bit in self.bits.items()}
+        self.signature = hashlib.sha1(json.dumps(specs, sort_keys=True, default=sorted).encode()).hexdigest()[:12]
+
+        self.prefix_masks = {}
+        self.label_masks = {}
+        self.type_masks = {}
+        self.untyped = 0      # classifiers with no type requirement
+        self.summary = []     # (bit, regex)
+        self.parent = []      # (bit, regex)
+        self.exclude = []     # (bit, regex)
+        self.exclusive = 0    # classifiers that have exclude rules
+        self.always = 0       # classifiers matching on type alone
+        for spec in specs:
+            bit = self.bits[spec['tag']]
+            for p in spec.get('key_prefixes', ()):
+                self.prefix_masks[p] = self.prefix_masks.get(p, 0) | bit
+            for l in spec.get('labels', ()):
+                self.label_masks[l.lower()] = self.label_masks.get(l.lower(), 0) | bit
+            if spec.get('types'):
+                for t in spec['types']:
+                    self.type_masks[t.lower()] = self.type_masks.get(t.lower(), 0) | bit
+            else:
+                self.untyped |= bit
+            if spec.get('summary'):
+                self.summary.append((bit, compile_rules(spec['summary'])))
+            if spec.get('parent'):
+                self.parent.append((bit, compile_rules(spec['parent'])))
+            if spec.get('exclude'):
+                self.exclude.append((bit, compile_rules(spec['exclude'])))
+                self.exclusive |= bit
+            if not any(spec.get(k) for k in ('key_prefixes', 'labels', 'summary', 'parent')):
+                self.always |= bit
+
+    def parent_match(self, parent_summary):
+        """{tag: parent rule name} a parent summary contributes; cache this per parent key."""
+        match = {}
+        if parent_summary:
+            for bit, rx in self.parent:
+                m = rx.search(parent_summary)
+                if m:
+                    match[self.tag_of[bit]] = m.lastgroup
+        return match
+
+    def classify(self, raw, parent_match=None, parent_summary='', rules=None):
+        """Return the tag bitmask for one issue.
+
+        Pass `parent_match` from a per-parent cache when available; otherwise
+        `parent_summary` is matched here. A dict passed as `rules` is filled
+        with the rule that set each tag: 'type', 'project', 'label:<label>',
+        or the name of the summary or parent rule, in that order of precedence.
+        """
+        key = raw.get('key', '')
+        allowed = self.untyped | self.type_masks.get(issue_type(raw).lower(), 0)
+        if not allowed:
+            return 0
+
+        prefix = self.prefix_masks.get(key.split('-')[0], 0)
+        mask = self.always | prefix
+        labels = raw.get('labels') or ()
+        for l in labels:
+            mask |= self.label_masks.get(l.lower(), 0)
+        if rules is not None and mask:
+            for tag in self.names(self.always):
+                rules[tag] = 'type'
+            for tag in self.names(prefix):
+                rules.setdefault(tag, 'project')
+            for l in sorted(l.lower() for l in labels):
+                for tag in self.names(self.label_masks.get(l, 0)):
+                    rules.setdefault(tag, 'label:' + l)
+
+        summary = raw.get('summary', '') or ''
+        for bit, rx in self.summary:
+            if allowed & bit and not mask & bit:
+                m = rx.search(summary)
+                if m:
+                    mask |= bit
+                    if rules is not None:
+                        rules[self.tag_of[bit]] = m.lastgroup
+
+        if parent_match is None:
+            parent_match = self.parent_match(parent_summary)
+        for tag, rule in parent_match.items():
+            bit = self.bits[tag]
+            if not mask & bit:
+                mask |= bit
+                if rules is not None:
+                    rules[tag] = rule
+        mask &= allowed
+
+        if mask & self.exclusive:
+            for bit, rx in self.exclude:
+                if mask & bit and rx.search(summary):
+                    mask &= ~bit
+        if rules:
+            for tag in [t for t in rules if not mask & self.bits[t]]:
+                del rules[tag]
+        return mask
+
+    def names(self, mask):
+        return [tag for tag in self.tags if mask & self.bits[tag]]
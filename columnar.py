@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Dictionary-encoded columnar payloads for the dashboard pages.
+
+A list of records becomes one list per field instead of one object per
+record, so field names are written once, and categorical fields (project,
+status, assignee, ...) are stored as small integer codes into a per-field
+dictionary of their distinct values, most frequent first so the commonest
+values get the shortest codes. A list-valued categorical field (labels)
+becomes a list of codes per record.
+
+Layout (JSON):
+    {'n': N,
+     'columns': {field: [value or code, ...]},   # N entries each
+     'dicts': {field: [distinct values]}}         # categorical fields only
+
+Row i of the original is columns[f][i] for every field, looked up in
+dicts[f] when f is categorical; the pages work on the columns directly
+(COLUMNAR_JS).
+"""
+from collections import Counter
+
+
+def encode(rows, fields, categorical=()):
+    """Columnar payload of `rows` (dicts); fields missing from a row are ''."""
+    columns, dicts = {}, {}
+    for field in fields:
+        col = [row.get(field, '') for row in rows]
+        if field in categorical:
+            multi = any(isinstance(v, list) for v in col)
+            counts = Counter(x for v in col for x in v) if multi else Counter(col)
+            values = sorted(counts, key=lambda v: (-counts[v], v))
+            code = {v: i for i, v in enumerate(values)}
+            col = [[code[x] for x in v] for v in col] if multi else [code[v] for v in col]
+            dicts[field] = values
+        columns[field] = col
+    return {'n': len(rows), 'columns': columns, 'dicts': dicts}
+
+
+def decode(payload):
+    """The records encode() was given, as dicts with every encoded field."""
+    columns, dicts = payload['columns'], payload['dicts']
+    rows = [{} for _ in range(payload['n'])]
+    for field, col in columns.items():
+        d = dicts.get(field)
+        for row, v in zip(rows, col):
+            if d is None:
+                row[field] = v
+            else:
+                row[field] = [d[x] for x in v] if isinstance(v, list) else d[v]
+    return rows
+
+
+# Inlined in the pages. columnar(payload).value(field, i) decodes one cell;
+# hot loops read .columns / .dicts directly.
+COLUMNAR_JS = '''function columnar(payload) {
+  const columns = payload.columns, dicts = payload.dicts;
+  return {
+    n: payload.n, columns, dicts,
+    value(field, i) {
+      const v = columns[field][i], d = dicts[field];
+      return d ? (Array.isArray(v) ? v.map(c => d[c]) : d[v]) : v;
+    }
+  };
+}'''
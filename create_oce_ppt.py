@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Generate OCE Active Tickets PowerPoint Presentation for Blend Engineering."""
 
+import sys
+
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
@@ -10,6 +13,19 @@ from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_LABEL_POSITION
 from pptx.chart.data import CategoryChartData
 import datetime
 
+from buildstamps import BuildStamp
+from output import atomic_output
+from pptx_tables import BulkTable, CellStyle, TableStyle
+
+OUTPUT_PATH = '/Users/vinay-prasadg/Documents/Production Defects/OCE-Active-Tickets-Report.pptx'
+
+# The deck's data is written into this script, so its source is the whole
+# input; skip the build when it and python-pptx are unchanged (buildstamps.py)
+stamp = BuildStamp('oce-deck', ['create_oce_ppt.py', 'pptx_tables.py', 'output.py']).input('python-pptx', pptx.__version__)
+if stamp.fresh():
+    print(stamp.skip_message())
+    sys.exit(0)
+
 # ── Colors ──────────────────────────────────────────────────────────────────
 BG_DARK      = RGBColor(0x07, 0x0B, 0x14)
 BG_CARD      = RGBColor(0x11, 0x18, 0x27)
@@ -70,39 +86,21 @@ def add_kpi_card(slide, left, top, value, label, accent_color):
     add_text_box(slide, left + Inches(0.1), top + Inches(0.72), Inches(1.6), Inches(0.4),
                  label, font_size=8, color=TEXT_GRAY, bold=False, alignment=PP_ALIGN.CENTER)
 
-def add_table_slide(slide, headers, rows, left, top, width, col_widths, row_height=Inches(0.35)):
-    table_shape = slide.shapes.add_table(len(rows) + 1, len(headers), left, top, width, Inches(0.35) * (len(rows) + 1))
-    table = table_shape.table
-
-    # Set column widths
-    for i, w in enumerate(col_widths):
-        table.columns[i].width = w
-
-    # Header
-    for i, h in enumerate(headers):
-        cell = table.cell(0, i)
-        cell.text = h
-        for paragraph in cell.text_frame.paragraphs:
-            paragraph.font.size = Pt(9)
-            paragraph.font.bold = True
-            paragraph.font.color.rgb = TEXT_GRAY
-            paragraph.font.name = 'Segoe UI'
-        cell.fill.solid()
-        cell.fill.fore_color.rgb = RGBColor(0x0D, 0x11, 0x1E)
-
-    # Rows
-    for r_idx, row in enumerate(rows):
-        for c_idx, val in enumerate(row):
-            cell = table.cell(r_idx + 1, c_idx)
-            cell.text = str(val)
-            for paragraph in cell.text_frame.paragraphs:
-                paragraph.font.size = Pt(8)
-                paragraph.font.color.rgb = TEXT_WHITE
-                paragraph.font.name = 'Segoe UI'
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = BG_CARD if r_idx % 2 == 0 else RGBColor(0x0D, 0x11, 0x1E)
-
-    return table_shape
+def add_titled_slide(title, color):
+    """Blank dark slide with the accent bars and a title."""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    set_slide_bg(slide, BG_DARK)
+    add_shape(slide, Inches(0), Inches(0), prs.slide_width, Inches(0.06), ACCENT_RED)
+    add_text_box(slide, Inches(0.5), Inches(0.3), Inches(12), Inches(0.6), title, font_size=24, color=color, bold=True)
+    add_shape(slide, Inches(0), Inches(7.44), prs.slide_width, Inches(0.06), ACCENT_RED)
+    return slide
+
+# Ticket tables are built in bulk from cell XML templates and continue onto
+# as many slides as their rows need (pptx_tables.py)
+TABLE_DARK   = RGBColor(0x0D, 0x11, 0x1E)
+TABLE_HEADER = CellStyle(size=9, color=TEXT_GRAY, bold=True, fill=TABLE_DARK)
+TABLE_BANDS  = [CellStyle(size=8, color=TEXT_WHITE, fill=BG_CARD), CellStyle(size=8, color=TEXT_WHITE, fill=TABLE_DARK)]
+TABLE_BOTTOM = Inches(7.3)
 
 # ═══════════════════════════════════════════════════════════════════════════
 #  SLIDE 1 — Title Slide
@@ -427,16 +425,9 @@ add_shape(slide5, Inches(0), Inches(7.44), prs.slide_width, Inches(0.06), ACCENT
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-#  SLIDE 6 — P0/P1 Critical Tickets (Table)
+#  SLIDE 6 — P0/P1 Critical Tickets (Table, continued over more slides if long)
 # ═══════════════════════════════════════════════════════════════════════════
 
-slide6 = prs.slides.add_slide(prs.slide_layouts[6])
-set_slide_bg(slide6, BG_DARK)
-add_shape(slide6, Inches(0), Inches(0), prs.slide_width, Inches(0.06), ACCENT_RED)
-
-add_text_box(slide6, Inches(0.5), Inches(0.3), Inches(12), Inches(0.6),
-             'P0/P1 Critical Tickets — Immediate Attention Required', font_size=24, color=RED, bold=True)
-
 p1_tickets = [
     ['CBP-13372', 'CBP', 'CP enablement stuck nodes for many tenants', 'P1', 'To Do', 'Unassigned'],
     ['CBP-13333', 'CBP', 'Document upload screen blanks out', 'P1', 'To Do', 'Unassigned'],
@@ -457,10 +448,12 @@ p1_tickets = [
 headers = ['Ticket', 'Project', 'Summary', 'Priority', 'Status', 'Assignee']
 col_widths = [Inches(1.1), Inches(0.7), Inches(5.4), Inches(0.8), Inches(1.4), Inches(1.8)]
 
-add_table_slide(slide6, headers, p1_tickets,
-                Inches(0.5), Inches(1.2), Inches(11.2), col_widths)
+def p1_slide(page, pages):
+    title = 'P0/P1 Critical Tickets — Immediate Attention Required'
+    return add_titled_slide(title if pages == 1 else f'{title} ({page}/{pages})', RED)
 
-add_shape(slide6, Inches(0), Inches(7.44), prs.slide_width, Inches(0.06), ACCENT_RED)
+p1_table = BulkTable(headers, col_widths, TableStyle(TABLE_HEADER, TABLE_BANDS))
+p1_table.add_paged(p1_slide, p1_tickets, Inches(0.5), Inches(1.2), TABLE_BOTTOM)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -726,7 +719,8 @@ add_shape(slide10, Inches(0), Inches(7.44), prs.slide_width, Inches(0.06), ACCEN
 #  Save
 # ═══════════════════════════════════════════════════════════════════════════
 
-output_path = '/Users/vinay-prasadg/Documents/Production Defects/OCE-Active-Tickets-Report.pptx'
-prs.save(output_path)
-print(f'Presentation saved to: {output_path}')
+with atomic_output(OUTPUT_PATH, 'wb') as f:
+    prs.save(f)
+stamp.save([OUTPUT_PATH])
+print(f'Presentation saved to: {OUTPUT_PATH}')
 print(f'Slides: {len(prs.slides)}')
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Content-hashed JSON data files for the dashboard pages.
+
+Builders write each page's data to `data/<name>.<hash>.json` next to the
+page and point `data/manifest.json` at it; the page shell fetches the
+manifest (revalidated on every load, it is tiny) and then the data file,
+which never changes under a given name and can be cached forever. A refresh
+whose data has not changed writes nothing; one that has writes the new data
+file and the manifest, and keeps the previous version so a page that has
+just read the old manifest can still load it.
+
+Set DASHBOARD_GZIP=1 to also write a precompressed `<file>.gz` beside each
+data file for servers that serve static .gz files (nginx gzip_static).
+
+Pages opened straight from disk (file://) can't fetch; serve the folder,
+e.g. `python3 -m http.server`, or open the offline bundle (build_bundle.py),
+which also ships each data file as a script the loader falls back to.
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+
+from output import write_atomic
+
+DATA_DIR = 'data'
+MANIFEST = 'manifest.json'
+GZIP = os.environ.get('DASHBOARD_GZIP') == '1'
+
+# Inlined in the page shells: resolve a data name through the manifest and fetch it.
+# Opened from disk (file://) fetch is blocked, so the offline bundle (build_bundle.py)
+# ships every data file and the manifest as `<file>.js` too, a script that hands the
+# payload to dashboardData(); loadJSON() loads that instead.
+LOADER_JS = '''let dataManifest = null;
+const dataScripts = {};
+function dashboardData(path, payload) { const s = dataScripts[path]; if (s) s.resolve(payload); }
+function loadJSON(path, init) {
+  if (location.protocol !== 'file:')
+    return fetch(path, init).then(r => { if (!r.ok) throw new Error(path + ': ' + r.status); return r.json(); });
+  let s = dataScripts[path];
+  if (!s) {
+    s = dataScripts[path] = {};
+    s.promise = new Promise((resolve, reject) => {
+      s.resolve = resolve;
+      const tag = document.createElement('script');
+      tag.src = path + '.js';
+      tag.onerror = () => reject(new Error(path + '.js: not found'));
+      document.head.appendChild(tag);
+    });
+  }
+  return s.promise;
+}
+function loadManifest() {
+  return dataManifest || (dataManifest = loadJSON('data/manifest.json', {cache: 'no-cache'}));
+}
+function loadData(name) {
+  return loadManifest()
+    .then(m => { if (!m[name]) throw new Error('no data file for ' + name); return loadJSON('data/' + m[name]); });
+}
+// Search index sidecar (search_index.SEARCH_JS) for data file `name`, or null if it
+// is missing or was built for another version of the data
+function loadSearchIndex(name) {
+  return Promise.all([loadManifest(), loadData(name + '-search')])
+    .then(([m, idx]) => idx.data === 'data/' + m[name] ? searchIndex(idx) : null)
+    .catch(() => null);
+}'''
+
+
+def read_manifest(page_dir):
+    path = os.path.join(page_dir, DATA_DIR, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+@contextmanager
+def _manifest_lock(data_dir):
+    """Serialize manifest updates from builders running side by side (build_all.py)."""
+    with open(os.path.join(data_dir, '.manifest.lock'), 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def write_data(page_dir, name, payload, compress=None):
+    """Write `payload` as the `name` data file of the pages in page_dir.
+
+    Returns the data file's path relative to page_dir.
+    """
+    compress = GZIP if compress is None else compress
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    fname = f'{name}.{hashlib.sha256(body).hexdigest()[:12]}.json'
+    data_dir = os.path.join(page_dir, DATA_DIR)
+    os.makedirs(data_dir, exist_ok=True)
+
+    path = os.path.join(data_dir, fname)
+    if not os.path.exists(path):
+        write_atomic(path, body)
+    if compress and not os.path.exists(path + '.gz'):
+        write_atomic(path + '.gz', gzip.compress(body, 9, mtime=0))
+
+    with _manifest_lock(data_dir):
+        manifest = read_manifest(page_dir)
+        previous = manifest.get(name)
+        if previous != fname:
+            manifest[name] = fname
+            write_atomic(os.path.join(data_dir, MANIFEST),
+                          json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8') + b'\n')
+    if previous != fname:
+        # Drop versions older than the one just replaced
+        keep = {fname, previous}
+        versions = re.compile(rf'^{re.escape(name)}\.[0-9a-f]{{12}}\.json(\.gz)?$')
+        for f in os.listdir(data_dir):
+            m = versions.match(f)
+            if m and f[:len(f) - len(m.group(1) or '')] not in keep:
+                os.remove(os.path.join(data_dir, f))
+    return f'{DATA_DIR}/{fname}'
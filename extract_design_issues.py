@@ -10,63 +10,41 @@ Design criteria (any match):
   4. Issue belongs to a Design-category project (DDB, PRDS)
   5. Labels include "design", "UX", "ui-design", etc.
   6. Summary contains "redesign", "UX", "figma design", or "UI changes as per figma"
+
+The same pass tags every cached issue with the classifiers declared in
+classifiers.py (design, OCE, EPD-logged, production defect) and writes the
+per-issue tag bitmasks to issue_tags.json. Each run also appends the design backlog and open-OCE metrics, with every
+tracked issue's status, to the 'design' and 'oce' snapshot series used for
+trend charts (see snapshots.py).
+
+The tags and counts are materialized rollups (DesignRollups) kept under
+.dashboard-cache: after a sync only the issues the index took in since the
+last run, and the children of epics renamed since, are classified again,
+each moving its old contribution out of the counts and its new one in.
 """
 
 import json
 import os
-import re
 import sys
-from collections import defaultdict
+
+from classifiers import RuleEngine
+from breakdowns import Breakdowns
+from buildstamps import BuildStamp
+from jira_cache import STATE_DIR, ParentIndex, load_latest
+from output import atomic_output, write_atomic
+from snapshots import SnapshotStore
 
 BASE = '/Users/vinay-prasadg/.cursor/projects/Users-vinay-prasadg-Documents-Production-Defects/agent-tools'
 OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'design_issues.json')
+TAGS_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'issue_tags.json')
+ROLLUPS_PATH = os.path.join(STATE_DIR, 'design_rollups.json')
+ROLLUPS_VERSION = 1
 
-DESIGN_PROJECTS = {'DDB', 'PRDS'}
-DESIGN_LABELS = {'design', 'ux', 'ui-design', 'design-review', 'design-needed', 'ui', 'ux-design'}
-
-DESIGN_SUMMARY_PATTERNS = [
-    re.compile(r'^DESIGN\s*[-:]', re.IGNORECASE),
-    re.compile(r'\bdesign\b', re.IGNORECASE),
-    re.compile(r'\bredesign\b', re.IGNORECASE),
-    re.compile(r'\bfigma\b', re.IGNORECASE),
-    re.compile(r'\bUX\b'),
-    re.compile(r'\bUI changes\b', re.IGNORECASE),
-]
-
-EXCLUDE_PATTERNS = [
-    re.compile(r'updateDisclosuresPackages', re.IGNORECASE),
-    re.compile(r'Remove FF:', re.IGNORECASE),
-]
-
-
-def is_design_related(issue, parent_summary=''):
-    summary = issue.get('summary', '')
-    labels = [l.lower() for l in issue.get('labels', [])]
-    project = issue.get('key', '').split('-')[0] if 'key' in issue else ''
-
-    for ep in EXCLUDE_PATTERNS:
-        if ep.search(summary):
-            return False
-
-    if project in DESIGN_PROJECTS:
-        return True
-
-    for dl in DESIGN_LABELS:
-        if dl in labels:
-            return True
+# Code that shapes the outputs; a change to any of them rebuilds them (buildstamps.py)
+SOURCES = ('extract_design_issues.py', 'classifiers.py', 'breakdowns.py', 'jira_cache.py', 'snapshots.py', 'output.py')
 
-    for pat in DESIGN_SUMMARY_PATTERNS:
-        if pat.search(summary):
-            return True
 
-    if parent_summary:
-        if re.search(r'\bdesign\b', parent_summary, re.IGNORECASE):
-            return True
-
-    return False
-
-
-def extract_issue_data(raw):
+def extract_issue_data(raw, parent_summary=None):
     key = raw.get('key', '')
     project = key.split('-')[0] if key else ''
     status = raw.get('status', {})
@@ -74,7 +52,8 @@ def extract_issue_data(raw):
     assignee = raw.get('assignee', {})
     parent = raw.get('parent', {})
     parent_fields = parent.get('fields', {})
-    parent_summary = parent_fields.get('summary', '')
+    if parent_summary is None:
+        parent_summary = parent_fields.get('summary', '')
     parent_type = parent_fields.get('issuetype', {}).get('name', '')
     issuetype = raw.get('issuetype', {})
 
@@ -100,83 +79,202 @@ def extract_issue_data(raw):
     }
 
 
-def main():
-    all_issues = {}
-    files_scanned = 0
-    issues_scanned = 0
-
-    for fname in os.listdir(BASE):
-        if not fname.endswith('.txt'):
-            continue
-        fpath = os.path.join(BASE, fname)
+class DesignRollups:
+    """Tag counts, design breakdowns and epic status counts over all cached issues.
+
+    Each issue's contribution (tag mask, parent, design row, OCE status) is
+    kept beside the counts it went into, with the IssueIndex mark they are
+    up to date with. `update` re-derives only the issues changed since that
+    mark plus the children of parents renamed since, taking each one's old
+    contribution out and adding its new one. Everything is rebuilt when the
+    index was rebuilt or `builder_id` (classifiers and builder source)
+    differs from the one the rollups were made with.
+    """
+
+    def __init__(self, engine, builder_id, path=ROLLUPS_PATH):
+        self.engine = engine
+        self.builder_id = builder_id
+        self.path = path
+        self.applied = None  # IssueIndex.mark() of the last update
+        self.restored = False
+        self.derived = 0     # issues classified by the last update
+        self._reset()
+
+    def _reset(self):
+        self.rows = {}  # key -> {'mask': int, 'parent': str, 'design': issue, 'oce': [status, open]}
+        self.design = Breakdowns()
+        self.epics = {}  # parent key -> {status category: design issues}
+        self.tag_counts = dict.fromkeys(self.engine.tags, 0)
+        self.oce_open = 0
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return self
         try:
-            with open(fpath) as f:
-                content = f.read().strip()
-                if not content:
-                    continue
-                data = json.loads(content)
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            continue
-
-        files_scanned += 1
-
-        issues = []
-        if isinstance(data, dict) and 'issues' in data:
-            issues = data['issues']
-        elif isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict) and 'issues' in item:
-                    issues.extend(item['issues'])
-                elif isinstance(item, dict) and 'key' in item:
-                    issues.append(item)
-
-        for raw in issues:
-            issues_scanned += 1
-            key = raw.get('key', '')
-            if not key:
-                continue
-
-            parent = raw.get('parent', {})
-            parent_summary = parent.get('fields', {}).get('summary', '') if isinstance(parent, dict) else ''
-
-            if is_design_related(raw, parent_summary):
-                if key not in all_issues:
-                    all_issues[key] = extract_issue_data(raw)
-
-    design_issues = sorted(all_issues.values(), key=lambda x: x['key'])
-
-    by_project = defaultdict(list)
-    by_status = defaultdict(int)
-    by_priority = defaultdict(int)
-    by_type = defaultdict(int)
-    assignees = set()
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return self
+        if data.get('version') != ROLLUPS_VERSION or data.get('builder_id') != self.builder_id:
+            return self
+        self.applied = data['applied']
+        self.rows = data['rows']
+        self.design.restore(data['design'])
+        self.epics = data['epics']
+        self.tag_counts = data['tag_counts']
+        self.oce_open = data['oce_open']
+        self.restored = True
+        return self
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_atomic(self.path, json.dumps({
+            'version': ROLLUPS_VERSION,
+            'builder_id': self.builder_id,
+            'applied': self.applied,
+            'design': self.design.state(),
+            'epics': self.epics,
+            'tag_counts': self.tag_counts,
+            'oce_open': self.oce_open,
+            'rows': self.rows,
+        }))
+
+    def update(self, index, parents):
+        """Apply the issues changed in `index` since the last update; `parents` must be updated first."""
+        keys = index.changed_since(self.applied) if self.restored else None
+        renamed = parents.renamed_since(self.applied) if keys is not None else None
+        if renamed is None:
+            self._reset()
+            keys = index.entries.keys()
+        elif renamed:
+            keys = keys | {k for k, row in self.rows.items() if row['parent'] in renamed}
+        for key in keys:
+            self._apply(key, index.entries[key]['raw'], parents)
+        self.derived = len(keys)
+        self.applied = index.mark()
+        self.restored = True
+        return self
+
+    def _apply(self, key, raw, parents):
+        old = self.rows.pop(key, None)
+        if old is not None:
+            self._count(old, -1)
+        parent = raw.get('parent', {})
+        parent_key = parent.get('key', '') if isinstance(parent, dict) else ''
+
+        rules = {}
+        mask = self.engine.classify(raw, parent_match=parents.label(parent_key) or {}, rules=rules)
+        if not mask and not parent_key:
+            return  # contributes nothing and no parent rename can change that
+        row = {'mask': mask, 'parent': parent_key}
+        if mask & self.engine.bits['oce']:
+            status = raw.get('status') or {}
+            if not isinstance(status, dict):
+                status = {'name': str(status)}
+            row['oce'] = [status.get('name', ''), status.get('category') not in ('Done', 'done')]
+        if mask & self.engine.bits['design']:
+            issue = extract_issue_data(raw, parents.summary(parent_key) if parent_key else '')
+            issue['designRule'] = rules['design']
+            row['design'] = issue
+        self.rows[key] = row
+        self._count(row, 1)
+
+    def _count(self, row, sign):
+        """Add (sign 1) or take out (sign -1) one issue's contribution."""
+        for tag in self.engine.names(row['mask']):
+            self.tag_counts[tag] += sign
+        if 'oce' in row:
+            self.oce_open += sign * row['oce'][1]
+        issue = row.get('design')
+        if issue is None:
+            return
+        if sign > 0:
+            self.design.add(issue)
+        else:
+            self.design.remove(issue)
+        if issue['parentKey']:
+            epic = self.epics.setdefault(issue['parentKey'], {})
+            category = issue['statusCategory']
+            epic[category] = epic.get(category, 0) + sign
+            if not epic[category]:
+                del epic[category]
+                if not epic:
+                    del self.epics[issue['parentKey']]
 
-    for i in design_issues:
-        by_project[i['project']].append(i)
-        by_status[i['status']] += 1
-        by_priority[i['priority']] += 1
-        by_type[i['type']] += 1
-        if i['assignee'] and i['assignee'] != 'Unassigned':
-            assignees.add(i['assignee'])
+
+def main():
+    build(*load_latest(BASE))
+
+
+def build(index, stats):
+    """Classify, summarize and snapshot the issues of a refreshed IssueIndex."""
+    # The index is fully determined by the cache files it has read, so their
+    # fingerprints stand in for hashing every issue
+    stamp = BuildStamp('design-issues', SOURCES).input('cache', [index.cache_dir, index.files])
+    if stamp.fresh():
+        print(stamp.skip_message())
+        return
+
+    files_scanned = stats['files_total']
+    issues_scanned = stats['issues_read']
+
+    # Each epic's parent rules run once, from its freshest known summary, and
+    # the bits are shared by all of its children. Only issues changed since
+    # the last run (or under a renamed epic) are classified again; every
+    # classifier's tag (design, OCE, EPD, production defects) comes from
+    # that one pass.
+    engine = RuleEngine()
+    parents = ParentIndex(engine.parent_match, engine.signature).load().update(index)
+    parents.save()
+    rollups = DesignRollups(engine, stamp.sources + engine.signature).load()
+    incremental = rollups.restored
+    rollups.update(index, parents)
+    rollups.save()
+
+    rows = sorted(rollups.rows.items())
+    design_issues = [row['design'] for _, row in rows if 'design' in row]
+    tag_masks = {key: row['mask'] for key, row in rows if row['mask']}
+    tag_counts = rollups.tag_counts
+    oce_status = {key: row['oce'][0] for key, row in rows if 'oce' in row}
+    oce_open = rollups.oce_open
+
+    summary = rollups.design
+    by_project, by_status, by_priority, by_type, by_assignee = (
+        dict(sorted(summary.by(f).items())) for f in ('project', 'status', 'priority', 'type', 'assignee'))
+    by_epic = {epic: dict(sorted(counts.items())) for epic, counts in sorted(rollups.epics.items())}
+    assignees = {a for a in by_assignee if a and a != 'Unassigned'}
+
+    design_done = sum(summary.done.values())
+    design_changes = SnapshotStore('design').append(
+        {'total': len(design_issues), 'open': len(design_issues) - design_done, 'done': design_done},
+        {i['key']: i['status'] for i in design_issues})
+    oce_changes = SnapshotStore('oce').append(
+        {'total': len(oce_status), 'open': oce_open}, oce_status)
 
     print(f"\nDesign Issues Report")
     print(f"{'='*60}")
-    print(f"Files scanned:    {files_scanned}")
-    print(f"Issues scanned:   {issues_scanned}")
+    print(f"Files scanned:    {files_scanned} ({stats['files_read']} new)")
+    print(f"Issues scanned:   {issues_scanned} ({stats['replaced']} superseded older copies)")
+    print(f"Unique issues:    {len(index)}")
+    print(f"Parent epics:     {len(parents.parents)} ({parents.classified} summaries classified this run)")
+    print(f"Issues derived:   {rollups.derived} ({'changed since the last run' if incremental else 'full rebuild'})")
+    print(f"Tagged issues:    {len(tag_masks)} ({', '.join(f'{t}: {tag_counts[t]}' for t in engine.tags)})")
     print(f"Design issues:    {len(design_issues)}")
+    print(f"Snapshots:        design {design_changes[0]} metrics / {design_changes[1]} statuses changed, "
+          f"oce {oce_changes[0]} / {oce_changes[1]}")
     print(f"Projects:         {len(by_project)}")
     print(f"Active assignees: {len(assignees)}")
     print()
 
     print(f"BY PROJECT:")
     for proj in sorted(by_project.keys()):
-        items = by_project[proj]
-        done = sum(1 for i in items if i['statusCategory'] in ('Done', 'done'))
-        open_ = len(items) - done
-        print(f"  {proj:12s}  {len(items):3d} total  ({open_:2d} open, {done:2d} done)")
+        done, open_ = summary.done_open(proj)
+        print(f"  {proj:12s}  {by_project[proj]:3d} total  ({open_:2d} open, {done:2d} done)")
 
     print(f"\nBY STATUS:")
-    for st, cnt in sorted(by_status.items(), key=lambda x: -x[1]):
+    for st, cnt in sorted(by_status.items(), key=lambda x: (-x[1], x[0])):
         print(f"  {st:25s}  {cnt}")
 
     print(f"\nBY PRIORITY:")
@@ -184,13 +282,12 @@ def main():
         print(f"  {p:25s}  {cnt}")
 
     print(f"\nBY TYPE:")
-    for t, cnt in sorted(by_type.items(), key=lambda x: -x[1]):
+    for t, cnt in sorted(by_type.items(), key=lambda x: (-x[1], x[0])):
         print(f"  {t:25s}  {cnt}")
 
     print(f"\nASSIGNEES:")
     for a in sorted(assignees):
-        count = sum(1 for i in design_issues if i['assignee'] == a)
-        print(f"  {a:30s}  {count}")
+        print(f"  {a:30s}  {by_assignee[a]}")
 
     print(f"\nALL DESIGN ISSUES:")
     print(f"{'Key':15s} {'Project':8s} {'Status':20s} {'Priority':16s} {'Assignee':25s} Summary")
@@ -198,20 +295,31 @@ def main():
     for i in design_issues:
         print(f"{i['key']:15s} {i['project']:8s} {i['status']:20s} {i['priority']:16s} {i['assignee']:25s} {i['summary'][:60]}")
 
-    with open(OUTPUT, 'w') as f:
+    with atomic_output(OUTPUT) as f:
         json.dump({
             'generated': str(__import__('datetime').datetime.now()),
             'total': len(design_issues),
             'projects': len(by_project),
-            'by_project': {k: len(v) for k, v in by_project.items()},
-            'by_status': dict(by_status),
-            'by_priority': dict(by_priority),
-            'by_type': dict(by_type),
+            'by_project': by_project,
+            'by_status': by_status,
+            'by_priority': by_priority,
+            'by_type': by_type,
+            'by_epic': by_epic,
             'assignees': sorted(assignees),
             'issues': design_issues,
         }, f, indent=2)
     print(f"\nSaved {len(design_issues)} issues to {OUTPUT}")
 
+    with atomic_output(TAGS_OUTPUT) as f:
+        json.dump({
+            'generated': str(__import__('datetime').datetime.now()),
+            'tags': engine.tags,
+            'counts': {t: tag_counts[t] for t in engine.tags},
+            'issues': tag_masks,
+        }, f)
+    print(f"Saved tag masks for {len(tag_masks)} issues to {TAGS_OUTPUT}")
+    stamp.save([OUTPUT, TAGS_OUTPUT])
+
 
 if __name__ == '__main__':
     main()
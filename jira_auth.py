@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""JIRA REST credentials shared by the live-data builders.
+
+Credentials come from the environment when set, otherwise from the
+mcp-atlassian server entry in ~/.cursor/mcp.json, the same account the
+agent tools use:
+
+    JIRA_URL        — Base URL (default: https://blendlabs.atlassian.net)
+    JIRA_USER       — Email for basic auth (JIRA_USERNAME in mcp.json)
+    JIRA_API_TOKEN  — API token (https://id.atlassian.com/manage-profile/security/api-tokens)
+"""
+import json
+import os
+
+CONFIG_PATH = os.path.expanduser('~/.cursor/mcp.json')
+DEFAULT_URL = 'https://blendlabs.atlassian.net'
+
+
+def load_creds(config_path=CONFIG_PATH):
+    """(base_url, user, token), or None when neither source has a user and token."""
+    user = os.environ.get('JIRA_USER', '')
+    token = os.environ.get('JIRA_API_TOKEN', '')
+    if user and token:
+        return os.environ.get('JIRA_URL', DEFAULT_URL), user, token
+    try:
+        with open(config_path) as f:
+            env = json.load(f)['mcpServers']['mcp-atlassian']['env']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not env.get('JIRA_USERNAME') or not env.get('JIRA_API_TOKEN'):
+        return None
+    return env.get('JIRA_URL', DEFAULT_URL), env['JIRA_USERNAME'], env['JIRA_API_TOKEN']
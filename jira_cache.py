@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Shared access to the agent-tools JIRA cache.
+
+Every MCP tool call leaves one JSON dump in the agent-tools directory, so the
+same issue key routinely appears in several files taken at different times.
+IssueIndex resolves those duplicates in a single pass by the issue's
+`updated` timestamp (latest copy wins, ties broken by file name) and persists
+the winners, so later runs only read cache files they have not seen before.
+
+Every refresh bumps the index's generation and stamps the winners it takes
+in with it. Consumers that maintain state derived from the index (the
+parent index) keep the (epoch, generation) mark they last applied and ask
+for the keys changed since, so a consumer that did not run, or failed,
+after a refresh catches up on its next run instead of missing the change.
+"""
+import json
+import os
+import time
+from datetime import datetime
+
+from output import atomic_output
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(HERE, '.dashboard-cache')
+INDEX_PATH = os.path.join(STATE_DIR, 'issue_index.json')
+PARENT_INDEX_PATH = os.path.join(STATE_DIR, 'parent_index.json')
+INDEX_VERSION = 2
+PARENT_INDEX_VERSION = 4
+
+
+def read_cache_file(fpath):
+    """Return the raw issues stored in one cache dump, or None if unreadable."""
+    try:
+        with open(fpath) as f:
+            content = f.read().strip()
+        if not content:
+            return None
+        data = json.loads(content)
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+    issues = []
+    if isinstance(data, dict) and 'issues' in data:
+        issues = data['issues']
+    elif isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict) and 'issues' in item:
+                issues.extend(item['issues'])
+            elif isinstance(item, dict) and 'key' in item:
+                issues.append(item)
+    return issues
+
+
+def updated_ts(raw):
+    """Epoch seconds of an issue's `updated` field, 0.0 when missing."""
+    value = raw.get('updated') or ''
+    if not value:
+        return 0.0
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z'):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _fingerprint(fpath):
+    st = os.stat(fpath)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class IssueIndex:
+    """Latest-updated-wins dedup index over the cache directory.
+
+    `names` optionally restricts the index to a fixed set of file names
+    (the productivity report only reads its per-project dumps).
+    """
+
+    def __init__(self, cache_dir, path=INDEX_PATH, names=None):
+        self.cache_dir = cache_dir
+        self.path = path
+        self.names = set(names) if names is not None else None
+        self.files = {}    # file name -> [size, mtime_ns]
+        self.entries = {}  # key -> {'ts': float, 'file': str, 'gen': int, 'raw': dict}
+        self.epoch = ''    # new on every rebuild from scratch
+        self.generation = 0
+        self.rebuilt = False
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return self
+        if data.get('version') != INDEX_VERSION or data.get('cache_dir') != self.cache_dir:
+            return self
+        self.files = data.get('files', {})
+        self.entries = data.get('entries', {})
+        self.epoch = data.get('epoch', '')
+        self.generation = data.get('generation', 0)
+        return self
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_output(self.path) as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'cache_dir': self.cache_dir,
+                'files': self.files,
+                'epoch': self.epoch,
+                'generation': self.generation,
+                'entries': self.entries,
+            }, f)
+
+    def _offer(self, key, ts, fname, raw):
+        cur = self.entries.get(key)
+        if cur is None or (ts, fname) > (cur['ts'], cur['file']):
+            self.entries[key] = {'ts': ts, 'file': fname, 'gen': self.generation, 'raw': raw}
+            return True
+        return False
+
+    def refresh(self):
+        """Fold new cache files into the index and return scan statistics.
+
+        Files already indexed with an unchanged size/mtime are skipped. If a
+        previously indexed file changed or disappeared, its old winners may no
+        longer be valid, so the index is rebuilt from scratch.
+        """
+        current = {}
+        for fname in os.listdir(self.cache_dir):
+            if not fname.endswith('.txt'):
+                continue
+            if self.names is not None and fname not in self.names:
+                continue
+            current[fname] = _fingerprint(os.path.join(self.cache_dir, fname))
+
+        self.rebuilt = not self.files or any(current.get(f) != fp for f, fp in self.files.items())
+        if self.rebuilt:
+            self.files = {}
+            self.entries = {}
+            self.epoch = f'{time.time_ns():x}'
+            self.generation = 0
+        self.generation += 1
+
+        stats = {'files_total': len(current), 'files_read': 0, 'issues_read': 0, 'replaced': 0}
+        for fname in sorted(current):
+            if fname in self.files:
+                continue
+            issues = read_cache_file(os.path.join(self.cache_dir, fname))
+            self.files[fname] = current[fname]
+            if issues is None:
+                continue
+            stats['files_read'] += 1
+            for raw in issues:
+                stats['issues_read'] += 1
+                key = raw.get('key', '')
+                if not key:
+                    continue
+                had = key in self.entries
+                if self._offer(key, updated_ts(raw), fname, raw) and had:
+                    stats['replaced'] += 1
+        return stats
+
+    def mark(self):
+        """[epoch, generation] of the index as it stands, for changed_since."""
+        return [self.epoch, self.generation]
+
+    def changed_since(self, mark):
+        """Keys whose winning copy changed after `mark`, or None if the
+        index was rebuilt since (or there is no mark) and everything changed."""
+        if not mark or mark[0] != self.epoch:
+            return None
+        gen = mark[1]
+        return {k for k, e in self.entries.items() if e['gen'] > gen}
+
+    def dump_time(self, key):
+        """mtime (ns) of the cache file `key`'s winning copy was read from."""
+        return self.files[self.entries[key]['file']][1]
+
+    def issues(self):
+        """Winning raw issue per key, in key order."""
+        return {k: self.entries[k]['raw'] for k in sorted(self.entries)}
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ParentIndex:
+    """Freshest known summary per parent (epic) key, classified once.
+
+    Parent summaries reach us two ways: the epic's own record, and the
+    `parent.fields.summary` copy embedded in every child, which goes stale
+    when the epic is renamed. Each observation is stamped with the time of
+    the dump it was read from (a child's own `updated` time says nothing
+    about when its copy of the epic's name was current) and the latest one
+    wins, the epic's own record winning within a dump, so all children of
+    an epic see the same summary. `classify(summary)` runs only when a
+    parent's winning summary changes; results persist across runs, with the
+    IssueIndex mark they are up to date with, and are discarded if
+    `classifier_id` differs from the one they were made with. Each parent
+    also records the index generation its summary last changed at, so
+    consumers keeping per-child state can find renamed parents with
+    `renamed_since`.
+    """
+
+    def __init__(self, classify, classifier_id='', path=PARENT_INDEX_PATH):
+        self.classify = classify
+        self.classifier_id = classifier_id
+        self.path = path
+        self.parents = {}  # parent key -> {'summary': str, 'ts': int, 'own': bool, 'gen': int, 'label': classify(summary)|None}
+        self.applied = None  # IssueIndex.mark() of the last update
+        self.generation = 0  # of the IssueIndex being applied
+        self.classified = 0
+        self.restored = False
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return self
+        if data.get('version') != PARENT_INDEX_VERSION or data.get('classifier_id') != self.classifier_id:
+            return self
+        self.parents = data.get('parents', {})
+        self.applied = data.get('applied')
+        self.restored = True
+        return self
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with atomic_output(self.path) as f:
+            json.dump({
+                'version': PARENT_INDEX_VERSION,
+                'classifier_id': self.classifier_id,
+                'applied': self.applied,
+                'parents': self.parents,
+            }, f)
+
+    def observe(self, key, summary, ts, own=False):
+        """Offer `summary` for parent `key`, read from a dump taken at `ts`.
+
+        `own` marks the epic's own record, which wins over children's copies
+        from the same dump.
+        """
+        cur = self.parents.get(key)
+        if cur is not None and (ts, own) <= (cur['ts'], cur['own']):
+            return
+        if cur is None or cur['summary'] != summary:
+            label = self.classify(summary) if summary else None
+            self.classified += 1
+            gen = self.generation
+        else:
+            label, gen = cur['label'], cur['gen']
+        self.parents[key] = {'summary': summary, 'ts': ts, 'own': own, 'gen': gen, 'label': label}
+
+    def update(self, index):
+        """Fold in the issues that changed in `index` since the last update."""
+        keys = index.changed_since(self.applied) if self.restored else None
+        if keys is None:
+            self.parents = {}
+            keys = index.entries.keys()
+        self.generation = index.generation
+        for key in keys:
+            raw = index.entries[key]['raw']
+            ts = index.dump_time(key)
+            if key in self.parents:
+                self.observe(key, raw.get('summary', ''), ts, own=True)
+            parent = raw.get('parent')
+            if not isinstance(parent, dict) or not parent.get('key'):
+                continue
+            pkey = parent['key']
+            fresh = pkey not in self.parents
+            self.observe(pkey, (parent.get('fields') or {}).get('summary', ''), ts)
+            own = index.entries.get(pkey)
+            if fresh and own is not None:
+                self.observe(pkey, own['raw'].get('summary', ''), index.dump_time(pkey), own=True)
+        self.applied = index.mark()
+        self.restored = True
+        return self
+
+    def renamed_since(self, mark):
+        """Parent keys whose summary changed after IssueIndex mark `mark`,
+        or None if this index was not built on the same index epoch."""
+        if not mark or not self.applied or mark[0] != self.applied[0]:
+            return None
+        return {k for k, p in self.parents.items() if p['gen'] > mark[1]}
+
+    def summary(self, key):
+        return self.parents.get(key, {}).get('summary', '')
+
+    def label(self, key):
+        return self.parents.get(key, {}).get('label')
+
+
+def load_latest(cache_dir, path=INDEX_PATH, names=None):
+    """Load, refresh and persist an index in one call; returns (index, stats)."""
+    index = IssueIndex(cache_dir, path, names).load()
+    stats = index.refresh()
+    index.save()
+    return index, stats
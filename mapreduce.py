@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Shard-parallel map-reduce for the report rollups.
+
+Issues are sharded by project, each shard is rolled up in a worker process
+and the partial results are folded together with associative reducers, so
+the result is the same as the serial rollup whatever the shard order or
+worker count. Mappers and reducers are module-level functions so they can
+be sent to workers.
+
+Workers are forked on Linux. Elsewhere they are spawned: on macOS a child
+forked after the parent has used system frameworks (as requests does for
+HTTPS and proxy lookups) can crash, which is why Python defaults to spawn
+there. Spawned workers are sent their shards, and the calling script is
+hidden from them while they start so they do not re-run it; the report
+scripts do their work at import time.
+
+    productivity_rollup(issues, periods)  -> rollups.ProductivityRollup
+    epic_progress(all_epics, children)    -> epic_progress.EpicProgress
+    breakdowns(issues, **kwargs)          -> breakdowns.Breakdowns
+
+Small inputs (below SHARD_MIN_ITEMS) are rolled up serially; starting a
+pool costs more than it saves there.
+"""
+import multiprocessing as mp
+import os
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import partial, reduce
+
+from breakdowns import Breakdowns
+from epic_progress import EpicProgress
+
+SHARD_MIN_ITEMS = 50_000
+START_METHOD = 'fork' if sys.platform.startswith('linux') else 'spawn'
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def shard_by(items, key):
+    """{shard key: [items]} preserving item order within each shard."""
+    shards = {}
+    for item in items:
+        k = key(item)
+        group = shards.get(k)
+        if group is None:
+            group = shards[k] = []
+        group.append(item)
+    return shards
+
+
+@contextmanager
+def main_script_hidden():
+    """Start spawned processes without re-running the parent's __main__ script."""
+    main = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+
+def map_reduce(shards, mapper, reducer, workers=None):
+    """reducer-fold of mapper(shard) over shards, mapped in worker processes."""
+    shards = list(shards)
+    if not shards:
+        raise ValueError('map_reduce needs at least one shard')
+    workers = min(workers or default_workers(), len(shards))
+    if workers <= 1:
+        return reduce(reducer, map(mapper, shards))
+    ctx = mp.get_context(START_METHOD)
+    with ProcessPoolExecutor(workers, mp_context=ctx) as pool:
+        # Executor.map submits every shard, starting all workers, before it returns
+        with main_script_hidden() if START_METHOD != 'fork' else nullcontext():
+            results = pool.map(mapper, shards)
+        return reduce(reducer, results)
+
+
+def _use_pool(n_items, workers):
+    if workers is not None:
+        return workers != 1
+    return n_items >= SHARD_MIN_ITEMS and default_workers() > 1
+
+
+# ── Productivity: engineer x project x period cells ──────────────────────
+# rollups needs NumPy; import it only where productivity rollups are used.
+def _productivity_cells(shard):
+    from rollups import ProductivityRollup
+    issues = [{'assignee': a, 'project': p, 'sp': sp} for a, p, sp, _ in shard]
+    return ProductivityRollup(issues, [per for *_, per in shard]).cells()
+
+
+def _merge_cells(a, b):
+    for cell, (n, sp) in b.items():
+        cur = a.get(cell)
+        if cur is None:
+            a[cell] = [n, sp]
+        else:
+            cur[0] += n
+            cur[1] += sp
+    return a
+
+
+def productivity_rollup(issues, periods, workers=None):
+    from rollups import ProductivityRollup
+    if not issues or not _use_pool(len(issues), workers):
+        return ProductivityRollup(issues, periods)
+    rows = ((i['assignee'], i['project'], i.get('sp'), per) for i, per in zip(issues, periods))
+    shards = shard_by(rows, lambda r: r[1])
+    return ProductivityRollup.from_cells(map_reduce(shards.values(), _productivity_cells, _merge_cells, workers))
+
+
+# ── Epic progress ────────────────────────────────────────────────────────
+def _epic_progress(shard):
+    all_epics, children = shard
+    progress = EpicProgress()
+    progress.children = children
+    progress.finalize(all_epics)
+    progress.children = {}  # already folded into the rows; don't ship them back twice
+    return progress
+
+
+def _merge_progress(a, b):
+    return a.merge(b)
+
+
+def epic_progress(all_epics, children, workers=None):
+    """EpicProgress over `all_epics` given {epic key: {child key: child}}."""
+    if not all_epics or not _use_pool(len(all_epics) + sum(map(len, children.values())), workers):
+        progress = EpicProgress()
+        progress.children = children
+        return progress.finalize(all_epics)
+    by_proj = shard_by(all_epics.items(), lambda kv: kv[1].get('project', kv[0].split('-')[0]))
+    shards = [(dict(eps), {k: children[k] for k, _ in eps if k in children}) for eps in by_proj.values()]
+    return map_reduce(shards, _epic_progress, _merge_progress, workers)
+
+
+# ── Status / field breakdowns ────────────────────────────────────────────
+def _breakdowns(shard, **kwargs):
+    return Breakdowns(**kwargs).extend(shard)
+
+
+def _merge_breakdowns(a, b):
+    return a.merge(b)
+
+
+def breakdowns(issues, workers=None, shard_key='project', **kwargs):
+    if not issues or not _use_pool(len(issues), workers):
+        return Breakdowns(**kwargs).extend(issues)
+    shards = shard_by(issues, lambda i: i.get(shard_key, ''))
+    return map_reduce(shards.values(), partial(_breakdowns, **kwargs), _merge_breakdowns, workers)
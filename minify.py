@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""Conservative CSS and JavaScript minifiers for the offline bundle.
+
+Both work on a single left-to-right scan that copies strings, template
+literals and regular expressions verbatim and only drops comments and
+whitespace that cannot matter:
+
+- CSS: comments go, whitespace runs collapse to one space, spaces around
+  `{ } ; , >` and after `:` go, and so does the last `;` of a block.
+  Spaces before `(` are kept (`and (max-width...)`), as are spaces around
+  `+` / `-` (calc()).
+- JS: comments and indentation go, and a space is only kept between two
+  identifier characters or where dropping it would merge tokens (`a + +b`,
+  `1 .toFixed`). Line breaks are kept, so automatic semicolon insertion
+  sees the same code, except after `{ ( [ , ;` or before `} ) ]`, where a
+  line break can never end a statement.
+
+- HTML: indentation, trailing spaces and blank lines go outside <pre>,
+  <textarea>, <script> and <style>; every whitespace run keeps at least
+  one character, so text renders the same.
+
+css_units() splits a stylesheet into its top-level rules (at-rule blocks
+whole) for deduplication across pages.
+"""
+import re
+
+JS_KEYWORDS_BEFORE_EXPR = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+}
+IDENT = re.compile(r'[A-Za-z0-9_$\u0080-\uffff]')
+WORD_BEFORE = re.compile(r'[A-Za-z_$][\w$]*$')
+HTML_VERBATIM = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2>)', re.S | re.I)
+HTML_BLANKS = re.compile(r'[ \t]*\n\s*')
+
+
+def _is_ident(ch):
+    return bool(ch) and bool(IDENT.match(ch))
+
+
+def _skip_string(src, i):
+    """Index just past the quoted string starting at src[i]."""
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1
+        i += 1
+    return i
+
+
+# ── CSS ─────────────────────────────────────────────────────────────────
+
+def minify_css(src):
+    out = []
+    i, n = 0, len(src)
+    pending_space = False
+    while i < n:
+        ch = src[i]
+        if ch == '/' and src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            pending_space = True
+            continue
+        if ch.isspace():
+            pending_space = True
+            i += 1
+            continue
+        if pending_space and out:
+            prev = out[-1][-1]
+            if prev not in '{};,>:(' and ch not in '{};,>)':
+                out.append(' ')
+        pending_space = False
+        if ch in '"\'':
+            end = _skip_string(src, i)
+            out.append(src[i:end])
+            i = end
+            continue
+        if ch == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def css_units(css):
+    """Top-level rules of minified css, e.g. ['a{color:red}', '@media x{b{c:d}}']."""
+    units = []
+    depth, start, i, n = 0, 0, 0, len(css)
+    while i < n:
+        ch = css[i]
+        if ch in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                units.append(css[start:i + 1])
+                start = i + 1
+        elif ch == ';' and depth == 0:
+            # @import / @charset statement
+            units.append(css[start:i + 1])
+            start = i + 1
+        i += 1
+    if css[start:].strip():
+        units.append(css[start:])
+    return units
+
+
+def css_properties(unit):
+    """Names a rule sets, to tell whether two rules can override each other.
+
+    @keyframes count as their name; other at-rule blocks as everything
+    their nested rules set.
+    """
+    if unit.startswith('@keyframes') or unit.startswith('@-webkit-keyframes'):
+        return {unit[:unit.index('{')]}
+    if unit.startswith('@') and '{' not in unit:
+        return {unit}
+    props = set()
+    for body in re.findall(r'\{([^{}]*)\}', unit):
+        for decl in body.split(';'):
+            if ':' in decl:
+                props.add(decl.split(':', 1)[0].strip().lower())
+    if unit.startswith('@font-face'):
+        props.add('@font-face')
+    return props
+
+
+# ── JavaScript ──────────────────────────────────────────────────────────
+
+def _regex_allowed(out):
+    """Whether a `/` here starts a regex literal rather than a division."""
+    text = ''.join(out[-12:]).rstrip()
+    if not text:
+        return True
+    last = text[-1]
+    if last in '(,=:[!&|?{};+-*%<>~^\n':
+        return True
+    m = WORD_BEFORE.search(text)
+    return bool(m) and m.group(0) in JS_KEYWORDS_BEFORE_EXPR
+
+
+def _skip_regex(src, i):
+    i += 1
+    in_class = False
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            i += 1
+            while i < len(src) and _is_ident(src[i]):
+                i += 1  # flags
+            return i
+        elif ch == '\n':
+            return i
+        i += 1
+    return i
+
+
+def minify_js(src):
+    out = []          # emitted chunks
+    braces = []       # per open `${`: brace depth inside the substitution
+    i, n = 0, len(src)
+    space = newline = False
+
+    def last_char():
+        for chunk in reversed(out):
+            if chunk:
+                return chunk[-1]
+        return ''
+
+    def template(i):
+        """Copy a template literal chunk from src[i] (after ` or }) up to ` or ${."""
+        start = i
+        while i < n:
+            ch = src[i]
+            if ch == '\\':
+                i += 2
+                continue
+            if ch == '`':
+                out.append(src[start:i + 1])
+                return i + 1
+            if ch == '$' and src.startswith('${', i):
+                out.append(src[start:i + 2])
+                braces.append(0)
+                return i + 2
+            i += 1
+        out.append(src[start:])
+        return n
+
+    while i < n:
+        ch = src[i]
+        if ch == '/' and src.startswith('//', i):
+            end = src.find('\n', i)
+            i = n if end < 0 else end
+            continue
+        if ch == '/' and src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            if '\n' in src[i:end]:
+                newline = True
+            else:
+                space = True
+            i = n if end < 0 else end + 2
+            continue
+        if ch == '\n':
+            newline = True
+            i += 1
+            continue
+        if ch.isspace():
+            space = True
+            i += 1
+            continue
+
+        prev = last_char()
+        if newline and prev and prev not in '{([,;' and ch not in '})]':
+            out.append('\n')
+        elif (space or newline) and prev and (
+                (_is_ident(prev) and _is_ident(ch)) or (prev == ch and ch in '+-/')
+                or (prev.isdigit() and ch == '.')):
+            out.append(' ')
+        space = newline = False
+
+        if ch in '"\'':
+            end = _skip_string(src, i)
+            out.append(src[i:end])
+            i = end
+        elif ch == '`':
+            out.append('`')
+            i = template(i + 1)
+        elif ch == '/' and _regex_allowed(out):
+            end = _skip_regex(src, i)
+            out.append(src[i:end])
+            i = end
+        elif ch == '{' and braces:
+            braces[-1] += 1
+            out.append(ch)
+            i += 1
+        elif ch == '}' and braces:
+            if braces[-1] == 0:
+                braces.pop()
+                out.append('}')
+                i = template(i + 1)
+            else:
+                braces[-1] -= 1
+                out.append(ch)
+                i += 1
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+# ── HTML ────────────────────────────────────────────────────────────────
+
+def minify_html(html):
+    parts = HTML_VERBATIM.split(html)
+    out = []
+    # split() yields text, block, tag name, text, block, tag name, ...
+    for i in range(0, len(parts), 3):
+        out.append(HTML_BLANKS.sub('\n', parts[i]))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Streaming, atomic writes for generated reports.
+
+Builders write a report section by section as it renders instead of
+collecting the whole page in memory first:
+
+    with atomic_output(OUT) as out:
+        out.write(head)
+        for row in rows:
+            out.write(render(row))
+
+The sections go to a uniquely named temp file beside the target, which is
+renamed over the target when the block exits cleanly and removed if it
+raises, so a reader never sees a half-written report, a failed run leaves
+the last good one in place, and two writers of the same file (a build_all
+stage and a manual run) never share a temp file. Peak memory is one
+section, not the whole output.
+"""
+import os
+import resource
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# mkstemp creates files 0600; written files get the usual umask-based mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_output(path, mode='w', encoding='utf-8'):
+    """Open `path` for streaming writes that land atomically on success.
+
+    mode is 'w' (text) or 'wb' (bytes, e.g. for `Presentation.save`).
+    """
+    if mode not in ('w', 'wb'):
+        raise ValueError(f'atomic_output mode must be w or wb, not {mode!r}')
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + '.',
+                               suffix='.tmp')
+    f = os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding)
+    try:
+        with f:
+            os.chmod(tmp, 0o666 & ~_UMASK)
+            yield f
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+
+
+def write_atomic(path, body):
+    """Write bytes or str `body` to path in one atomic replace."""
+    with atomic_output(path, 'wb' if isinstance(body, bytes) else 'w') as f:
+        f.write(body)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
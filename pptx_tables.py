@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Bulk-built, auto-paginated tables for the PowerPoint decks.
+
+Styling a python-pptx table cell by cell costs a handful of property calls
+per cell (text, size, bold, color, font, fill), each walking and growing
+the cell's XML. A BulkTable instead compiles its styles once into the
+XML of a styled cell, one template per body band and column (plus the
+header row, rendered once), so a row is the templates joined around the
+escaped values, and a whole table is one string parsed in a single call.
+
+Rows that do not fit below `top` on one slide continue on further slides,
+each repeating the header:
+
+    table = BulkTable(headers, col_widths, TableStyle(...))
+    table.add_paged(new_slide, rows, left, top, bottom)
+
+Cells keep their full text and wrap, so a row is as tall as its longest
+cell. To paginate before anything is laid out, each cell's wrapped line
+count is estimated by word-wrapping its text at the column width with
+per-character Segoe UI widths. The widths are rounded up, and unknown
+characters count as wide, so the estimate errs tall and a page does not
+overflow `bottom`. Each row's height is set to its estimate.
+"""
+import math
+import re
+from xml.sax.saxutils import escape
+
+from pptx.oxml import parse_xml
+from pptx.util import Emu, Inches, Pt
+
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+MEDIUM_STYLE_2_ACCENT_1 = '{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}'  # python-pptx's default table style
+CELL_MARGINS_PT = 14.4  # default left + right cell insets, 0.1in each
+CELL_PADDING_PT = 7.2   # default top + bottom cell insets, 0.05in each
+LINE_SPACING = 1.2      # line height as a multiple of the font size
+ALIGN = {'left': 'l', 'center': 'ctr', 'right': 'r'}
+CONTROL = re.compile('[\x00-\x1f\x7f]+')  # not allowed in XML text; line breaks become spaces
+
+# Advance widths in ems, a little over Segoe UI's, by character class
+GLYPH_EM = {}
+for chars, em in ((' ', 0.28), ('fijlrtI!|.,:;\'"()[]`', 0.34), ('-/', 0.42), ('0123456789', 0.56),
+                  ('abcdeghknopqsuvxyz', 0.56), ('ABCDEFGHJKLNOPQRSTUVXYZ', 0.68), ('mwMW@%&', 0.92)):
+    GLYPH_EM.update(dict.fromkeys(chars, em))
+WIDE_EM = 1.0     # anything else (other punctuation, accents, CJK)
+BOLD_WIDTH = 1.06
+
+
+def _line_count(text, width_em):
+    """Lines `text` word-wraps to in a column `width_em` ems wide."""
+    if len(text) * WIDE_EM <= width_em:
+        return 1
+    width_em = max(width_em, WIDE_EM)
+    lines, used = 1, 0.0
+    for word in text.split():
+        w = sum(GLYPH_EM.get(c, WIDE_EM) for c in word)
+        if used:
+            if used + GLYPH_EM[' '] + w <= width_em:
+                used += GLYPH_EM[' '] + w
+                continue
+            lines += 1
+        # The word starts a line; one wider than the column breaks over several
+        full = math.ceil(w / width_em) or 1
+        lines += full - 1
+        used = w - (full - 1) * width_em
+    return lines
+
+
+class CellStyle:
+    """Character and fill properties of a cell. Colors are RGBColor or 'RRGGBB'."""
+
+    def __init__(self, size=8, color='E2E8F0', bold=False, font='Segoe UI', fill=None, align=None):
+        self.size = size
+        self.color = color
+        self.bold = bold
+        self.font = font
+        self.fill = fill
+        self.align = align
+
+
+class TableStyle:
+    """Header style, body bands (cycled row by row) and the minimum row height."""
+
+    def __init__(self, header, bands, row_height=Inches(0.35)):
+        self.header = header
+        self.bands = bands
+        self.row_height = row_height
+
+
+def _cell_xml(style):
+    """(before, after) the escaped text of a cell in `style`."""
+    ppr = f'<a:pPr algn="{ALIGN[style.align]}"/>' if style.align else ''
+    bold = ' b="1"' if style.bold else ''
+    fill = f'<a:solidFill><a:srgbClr val="{style.fill}"/></a:solidFill>' if style.fill else ''
+    return (f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p>{ppr}'
+            f'<a:r><a:rPr lang="en-US" sz="{int(style.size * 100)}"{bold} dirty="0">'
+            f'<a:solidFill><a:srgbClr val="{style.color}"/></a:solidFill>'
+            f'<a:latin typeface="{escape(style.font)}"/></a:rPr><a:t>',
+            f'</a:t></a:r></a:p></a:txBody><a:tcPr>{fill}</a:tcPr></a:tc>')
+
+
+def _text(value):
+    return CONTROL.sub(' ', '' if value is None else str(value))
+
+
+class BulkTable:
+    """A table layout compiled once; add_to / add_paged place rows of it on slides."""
+
+    def __init__(self, headers, col_widths, style):
+        self.headers = headers
+        self.col_widths = [Emu(int(w)) for w in col_widths]
+        self.width = Emu(sum(self.col_widths))
+        self.style = style
+        self.min_height = int(style.row_height)
+
+        # Per band, each column's cell template and what measuring its text needs
+        self.bands = [[self._column(band, w) for w in self.col_widths] for band in style.bands]
+
+        head_xml, head_h = self._row(headers, [self._column(style.header, w) for w in self.col_widths])
+        self.head_height = head_h
+        self.open = (f'<a:tbl xmlns:a="{NS_A}"><a:tblPr firstRow="1" bandRow="1">'
+                     f'<a:tableStyleId>{MEDIUM_STYLE_2_ACCENT_1}</a:tableStyleId></a:tblPr><a:tblGrid>'
+                     + ''.join(f'<a:gridCol w="{int(w)}"/>' for w in self.col_widths)
+                     + '</a:tblGrid>' + head_xml)
+
+    @staticmethod
+    def _column(style, width):
+        """((before, after) cell XML, column width in ems of the text, line height in EMU)."""
+        em = style.size * (BOLD_WIDTH if style.bold else 1)
+        return (_cell_xml(style), (width.pt - CELL_MARGINS_PT) / em, int(Pt(style.size * LINE_SPACING)))
+
+    def _row(self, row, cells):
+        """(<a:tr> XML, estimated height in EMU) of one row."""
+        parts, height = [], self.min_height
+        for v, ((pre, post), width_em, line_h) in zip(row, cells):
+            text = _text(v)
+            parts.append(pre + escape(text) + post)
+            height = max(height, _line_count(text, width_em) * line_h + int(Pt(CELL_PADDING_PT)))
+        return f'<a:tr h="{height}">' + ''.join(parts) + '</a:tr>', height
+
+    def _body(self, rows):
+        """[(row XML, height)] for rows under the header, bands restarting at the first."""
+        bands = self.bands
+        return [self._row(row, bands[i % len(bands)]) for i, row in enumerate(rows)]
+
+    def xml(self, rows):
+        """The <a:tbl> element for `rows` under the header, as a string."""
+        return self.open + ''.join(x for x, _ in self._body(rows)) + '</a:tbl>'
+
+    def _place(self, slide, body, left, top):
+        shape = slide.shapes.add_table(1, len(self.headers), left, top, self.width, self.head_height)
+        old = shape._element.graphic.graphicData.tbl
+        tbl = self.open + ''.join(x for x, _ in body) + '</a:tbl>'
+        old.getparent().replace(old, parse_xml(tbl))
+        shape.height = Emu(self.head_height + sum(h for _, h in body))
+        return shape
+
+    def add_to(self, slide, rows, left, top):
+        """Add the header and `rows` as one table shape at (left, top); returns the shape."""
+        return self._place(slide, self._body(rows), left, top)
+
+    def pages(self, rows, top, bottom):
+        """Split rows' [(row XML, height)] into pages that fit between top and bottom.
+
+        Every page holds at least one row, however tall.
+        """
+        room = int(bottom) - int(top) - self.head_height
+        bands = self.bands
+        pages, page, used = [], [], 0
+        for row in rows:
+            xml, h = self._row(row, bands[len(page) % len(bands)])
+            if page and used + h > room:
+                pages.append(page)
+                page, used = [], 0
+                xml, h = self._row(row, bands[0])
+            page.append((xml, h))
+            used += h
+        if page or not pages:
+            pages.append(page)
+        return pages
+
+    def add_paged(self, new_slide, rows, left, top, bottom):
+        """Lay rows out over as many slides as they need; returns the slides.
+
+        new_slide(page, pages) makes the slide for page `page` (1-based) of
+        `pages`, titles and all; the table goes at (left, top) on each and
+        ends above bottom.
+        """
+        pages = self.pages(rows, top, bottom)
+        slides = []
+        for n, body in enumerate(pages, 1):
+            slide = new_slide(n, len(pages))
+            self._place(slide, body, left, top)
+            slides.append(slide)
+        return slides
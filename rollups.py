@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Vectorized group-by rollups for the productivity report.
+
+Assignee, project and period (see periods.py) are factorized into integer
+code arrays and story points into a float array (missing SP masked to 0). A
+single weighted `bincount` over the flattened (engineer, project, period)
+code then yields dense issue and SP cubes, and every rollup the report
+needs — per-engineer, per-project, per-period and the leaderboard — is a
+NumPy reduction over those cubes rather than another walk over the issues.
+
+Cubes can also be built from sparse (engineer, project, period) cells, which
+is how per-shard rollups computed in worker processes (see mapreduce.py)
+are combined. Ties in every ordering are broken by name, so the result does
+not depend on the order issues or shards arrived in.
+"""
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("Install numpy: pip3 install numpy")
+
+
+def factorize(values):
+    """Return (int32 codes, uniques) with uniques in first-seen order."""
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values),
+                        dtype=np.int32, count=len(values))
+    return codes, list(index)
+
+
+def name_ranks(names):
+    """Rank of each name in sorted order, for deterministic tie-breaks."""
+    ranks = np.empty(len(names), dtype=np.int64)
+    ranks[np.argsort(np.array(names, dtype=object), kind='stable')] = np.arange(len(names))
+    return ranks
+
+
+def sp_array(values):
+    """Story points as float64 plus a mask of which issues carry a value."""
+    sp = np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(values))
+    has_sp = ~np.isnan(sp)
+    return np.where(has_sp, sp, 0.0), has_sp
+
+
+class ProductivityRollup:
+    """Issue-count and SP cubes indexed [engineer, project, period]."""
+
+    def __init__(self, issues, periods):
+        """`issues` are dicts with assignee/project/sp; `periods` holds one label per issue."""
+        eng, self.engineers = factorize([i['assignee'] for i in issues])
+        proj, self.projects = factorize([i['project'] for i in issues])
+        per, self.periods = factorize(periods)
+        sp, _ = sp_array([i.get('sp') for i in issues])
+        self._build(eng, proj, per, None, sp)
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Rollup from {(engineer, project, period): (issues, sp)} cells."""
+        self = cls.__new__(cls)
+        keys = list(cells)
+        eng, self.engineers = factorize([k[0] for k in keys])
+        proj, self.projects = factorize([k[1] for k in keys])
+        per, self.periods = factorize([k[2] for k in keys])
+        n = np.fromiter((v[0] for v in cells.values()), dtype=np.float64, count=len(keys))
+        sp = np.fromiter((v[1] for v in cells.values()), dtype=np.float64, count=len(keys))
+        self._build(eng, proj, per, n, sp)
+        return self
+
+    def _build(self, eng, proj, per, n, sp):
+        shape = (len(self.engineers), len(self.projects), len(self.periods))
+        size = shape[0] * shape[1] * shape[2]
+        flat = (eng.astype(np.int64) * shape[1] + proj) * shape[2] + per
+        if n is None:
+            self.count = np.bincount(flat, minlength=size).reshape(shape)
+        else:
+            self.count = np.bincount(flat, weights=n, minlength=size).astype(np.int64).reshape(shape)
+        self.sp = np.bincount(flat, weights=sp, minlength=size).reshape(shape)
+
+        self.eng_proj_count = self.count.sum(axis=2)
+        self.eng_proj_sp = self.sp.sum(axis=2)
+
+    def cells(self):
+        """Sparse {(engineer, project, period): [issues, sp]} for the non-empty cells."""
+        return {(self.engineers[e], self.projects[p], self.periods[q]): [int(self.count[e, p, q]), float(self.sp[e, p, q])]
+                for e, p, q in zip(*np.nonzero(self.count))}
+
+    @property
+    def total_issues(self):
+        return int(self.count.sum())
+
+    @property
+    def total_sp(self):
+        return float(self.sp.sum())
+
+    def project_summary(self):
+        """{project: {issues, sp, engineers}} in descending issue order."""
+        issues = self.eng_proj_count.sum(axis=0)
+        sp = self.eng_proj_sp.sum(axis=0)
+        engineers = (self.eng_proj_count > 0).sum(axis=0)
+        order = np.lexsort((name_ranks(self.projects), -issues))
+        return {self.projects[p]: {'issues': int(issues[p]), 'sp': float(sp[p]), 'engineers': int(engineers[p])}
+                for p in order}
+
+    def leaderboard(self):
+        """Per-engineer totals sorted by SP, then issues (both descending)."""
+        issues = self.eng_proj_count.sum(axis=1)
+        sp = self.eng_proj_sp.sum(axis=1)
+        active = self.eng_proj_count > 0
+        names = np.array(self.projects, dtype=object)
+        order = np.lexsort((name_ranks(self.engineers), -issues, -sp))
+        board = []
+        for e in order:
+            n, s = int(issues[e]), float(sp[e])
+            board.append({
+                'name': self.engineers[e],
+                'projects': sorted(names[active[e]]),
+                'total_issues': n,
+                'total_sp': s,
+                'avg_sp_per_issue': round(s / n, 1) if n else 0,
+            })
+        return board
+
+    def by_period_project(self, periods):
+        """({period: {proj: issues}}, {period: {proj: sp}}) for the requested periods."""
+        count = self.count.sum(axis=0)
+        sp = self.sp.sum(axis=0)
+        issues_out, sp_out = {}, {}
+        for per in periods:
+            if per not in self.periods:
+                issues_out[per], sp_out[per] = {}, {}
+                continue
+            i = self.periods.index(per)
+            issues_out[per] = {p: int(count[pi, i]) for pi, p in enumerate(self.projects) if count[pi, i]}
+            sp_out[per] = {p: float(sp[pi, i]) for pi, p in enumerate(self.projects) if count[pi, i]}
+        return issues_out, sp_out
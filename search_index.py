@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Prebuilt token/prefix inverted index for the dashboard search boxes.
+
+The builders index each page's documents (epics, design issues) by the
+tokens of their key, summary, assignee and parent summary, and write the
+index as a sidecar data file (see datafiles.py) next to the page's data.
+The page looks a query up with SEARCH_JS instead of scanning every
+document: each query token is a prefix, found by binary search over the
+sorted term list, and the tokens are ANDed together.
+
+Index layout (JSON):
+    {'data': <data file it indexes>, 'docs': N,
+     'terms': [sorted tokens], 'postings': [[doc id deltas], ...]}
+
+Postings are ascending doc ids (positions in the page's data array), delta
+encoded so most entries are one or two digits.
+"""
+import re
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokens(text):
+    """Lowercased alphanumeric tokens of text ('CBP-12' -> ['cbp', '12'])."""
+    return TOKEN.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """Inverted index from token to the ascending ids of documents containing it."""
+
+    def __init__(self):
+        self.postings = {}
+        self.docs = 0
+
+    def add(self, *texts):
+        """Index the next document (id = number of documents added so far)."""
+        doc = self.docs
+        self.docs += 1
+        for text in texts:
+            for tok in tokens(text):
+                ids = self.postings.get(tok)
+                if ids is None:
+                    self.postings[tok] = [doc]
+                elif ids[-1] != doc:
+                    ids.append(doc)
+        return doc
+
+    def to_dict(self, data_file=None):
+        terms = sorted(self.postings)
+        postings = []
+        for term in terms:
+            ids, prev, deltas = self.postings[term], 0, []
+            for i in ids:
+                deltas.append(i - prev)
+                prev = i
+            postings.append(deltas)
+        return {'data': data_file, 'docs': self.docs, 'terms': terms, 'postings': postings}
+
+
+# Inlined in the pages after LOADER_JS. searchIndex(idx).search(q) returns a
+# Set of matching doc ids, or null when q has no tokens (nothing to filter).
+SEARCH_JS = '''function searchIndex(idx) {
+  const terms = idx.terms, postings = idx.postings, decoded = new Map();
+  function ids(t) {
+    let d = decoded.get(t);
+    if (!d) {
+      d = [];
+      let id = 0;
+      for (const delta of postings[t]) { id += delta; d.push(id); }
+      decoded.set(t, d);
+    }
+    return d;
+  }
+  function range(p) {
+    let lo = 0, hi = terms.length;
+    while (lo < hi) { const mid = (lo + hi) >> 1; if (terms[mid] < p) lo = mid + 1; else hi = mid; }
+    let end = lo, size = 0;
+    while (end < terms.length && terms[end].startsWith(p)) size += postings[end++].length;
+    return {lo, end, size};
+  }
+  let lastQuery = null, lastHits = null;
+  return {
+    data: idx.data,
+    search(q) {
+      if (q === lastQuery) return lastHits;
+      lastQuery = q;
+      return (lastHits = this.lookup(q));
+    },
+    lookup(q) {
+      const toks = (q || '').toLowerCase().match(/[a-z0-9]+/g);
+      if (!toks) return null;
+      // Rarest token first; later tokens only keep ids already matched
+      const ranges = toks.map(range).sort((a, b) => a.size - b.size);
+      let hits = null;
+      for (const {lo, end} of ranges) {
+        const out = new Set();
+        for (let t = lo; t < end; t++) for (const id of ids(t)) if (!hits || hits.has(id)) out.add(id);
+        hits = out;
+        if (!hits.size) break;
+      }
+      return hits;
+    }
+  };
+}'''
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Delta-encoded history of builder metrics and per-issue status.
+
+Each builder run calls SnapshotStore(series).append(metrics, statuses). Only
+what differs from the previous snapshot is written: the metrics whose value
+changed, the issues whose status changed or that appeared, and the keys that
+disappeared. A run that changes nothing writes nothing, so a series grows
+with the amount of change rather than with the number of runs.
+
+A series is two append-only JSON-lines logs under .dashboard-cache/snapshots
+(metrics and statuses are kept apart so trend charts never parse per-issue
+records) plus a small state file holding the latest values, which lets
+`append` diff without replaying the logs. Queries replay one log once, in
+time order, so a year of hourly runs is a few thousand short lines.
+
+A run interrupted mid-write can leave a torn last line. Readers skip lines
+that do not parse, and the next append first cuts the log back to its last
+complete line, so a torn record never swallows the ones written after it.
+"""
+import json
+import os
+import time
+
+from jira_cache import STATE_DIR
+from output import atomic_output
+
+SNAPSHOT_DIR = os.path.join(STATE_DIR, 'snapshots')
+
+
+def _complete_length(f, end, chunk=65536):
+    """Length of the file up to and including its last newline."""
+    pos = end
+    while pos > 0:
+        start = max(0, pos - chunk)
+        f.seek(start)
+        nl = f.read(pos - start).rfind(b'\n')
+        if nl >= 0:
+            return start + nl + 1
+        pos = start
+    return 0
+
+
+def _append_line(path, record):
+    with open(path, 'ab+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b'\n':
+                f.truncate(_complete_length(f, end))  # drop a torn line left by an interrupted run
+        f.write(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+
+
+def _read_lines(path):
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn line from an interrupted run
+
+
+class SnapshotStore:
+    """Append-only metric and status history for one named series."""
+
+    def __init__(self, series, root=SNAPSHOT_DIR):
+        self.series = series
+        self.root = root
+        self.metrics_path = os.path.join(root, f'{series}.metrics.jsonl')
+        self.status_path = os.path.join(root, f'{series}.status.jsonl')
+        self.state_path = os.path.join(root, f'{series}.state.json')
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+        # No (or unreadable) state file: rebuild it from the logs
+        state = {'t': 0, 'metrics': {}, 'status': {}}
+        for rec in _read_lines(self.metrics_path):
+            state['t'] = max(state['t'], rec['t'])
+            state['metrics'].update(rec['m'])
+        for rec in _read_lines(self.status_path):
+            state['t'] = max(state['t'], rec['t'])
+            state['status'].update(rec.get('s', {}))
+            for key in rec.get('x', ()):
+                state['status'].pop(key, None)
+        return state
+
+    def _save_state(self, state):
+        with atomic_output(self.state_path) as f:
+            json.dump(state, f, separators=(',', ':'))
+
+    def append(self, metrics, statuses=None, ts=None):
+        """Record one snapshot; returns (metrics changed, statuses changed).
+
+        `metrics` maps name -> JSON scalar. `statuses` maps issue key ->
+        status string and is the complete current set (keys missing from it
+        are recorded as removed); pass None to leave statuses untouched.
+        A `ts` older than the last snapshot (the clock stepped back) is
+        recorded at the last snapshot's time, so the logs stay in order.
+        """
+        ts = int(ts if ts is not None else time.time())
+        os.makedirs(self.root, exist_ok=True)
+        state = self._load_state()
+        if ts < state['t']:
+            print(f'WARNING: {self.series} snapshot time {ts} is before the last one ({state["t"]}); using {state["t"]}')
+            ts = state['t']
+
+        prev = state['metrics']
+        m_delta = {k: v for k, v in metrics.items() if k not in prev or prev[k] != v}
+        s_delta, removed = {}, []
+        if statuses is not None:
+            prev_s = state['status']
+            s_delta = {k: v for k, v in statuses.items() if prev_s.get(k) != v}
+            removed = [k for k in prev_s if k not in statuses]
+
+        if m_delta:
+            _append_line(self.metrics_path, {'t': ts, 'm': m_delta})
+            prev.update(m_delta)
+        if s_delta or removed:
+            rec = {'t': ts}
+            if s_delta:
+                rec['s'] = s_delta
+            if removed:
+                rec['x'] = removed
+            _append_line(self.status_path, rec)
+            state['status'].update(s_delta)
+            for key in removed:
+                del state['status'][key]
+        if m_delta or s_delta or removed:
+            state['t'] = ts
+            self._save_state(state)
+        return len(m_delta), len(s_delta) + len(removed)
+
+    def metric_series(self, names=None, since=None, until=None):
+        """Step series of metrics: {'t': [...], name: [...]}.
+
+        One point per recorded change inside [since, until], plus a leading
+        point at `since` carrying the values in effect then. Metrics not yet
+        recorded at a point are None.
+        """
+        names = list(names) if names is not None else None
+        current, out_t, rows = {}, [], []
+        for rec in _read_lines(self.metrics_path):
+            t = rec['t']
+            if until is not None and t > until:
+                break
+            if since is not None and t < since:
+                current.update(rec['m'])
+                continue
+            if since is not None and not out_t and current and t > since:
+                out_t.append(since)
+                rows.append(dict(current))
+            current.update(rec['m'])
+            out_t.append(t)
+            rows.append(dict(current))
+        if since is not None and not out_t and current:
+            out_t.append(since)
+            rows.append(dict(current))
+        if names is None:
+            names = sorted({k for r in rows for k in r})
+        series = {'t': out_t}
+        for name in names:
+            series[name] = [r.get(name) for r in rows]
+        return series
+
+    def status_at(self, ts=None):
+        """{issue key: status} as of `ts` (latest when None)."""
+        if ts is None:
+            return dict(self._load_state()['status'])
+        status = {}
+        for rec in _read_lines(self.status_path):
+            if rec['t'] > ts:
+                break
+            status.update(rec.get('s', {}))
+            for key in rec.get('x', ()):
+                status.pop(key, None)
+        return status
+
+    def status_counts(self, since=None, until=None):
+        """Issue count per status at each recorded change: [(t, {status: n})].
+
+        Counts are maintained incrementally while the log is replayed, so the
+        cost is proportional to the number of status changes, not issues x runs.
+        """
+        status, counts, out = {}, {}, []
+
+        def move(key, new):
+            old = status.get(key)
+            if old is not None:
+                counts[old] -= 1
+                if not counts[old]:
+                    del counts[old]
+            if new is None:
+                status.pop(key, None)
+            else:
+                status[key] = new
+                counts[new] = counts.get(new, 0) + 1
+
+        for rec in _read_lines(self.status_path):
+            t = rec['t']
+            if until is not None and t > until:
+                break
+            if since is not None and t > since and not out and counts:
+                out.append((since, dict(counts)))
+            for key, value in rec.get('s', {}).items():
+                move(key, value)
+            for key in rec.get('x', ()):
+                move(key, None)
+            if since is None or t >= since:
+                out.append((t, dict(counts)))
+        if since is not None and not out and counts:
+            out.append((since, dict(counts)))
+        return out
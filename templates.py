@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Minimal precompiled HTML templates for the report builders.
+
+A Template is compiled once, at import, into a Python function that builds
+the whole fragment with a single f-string; rendering calls it and writes the
+result to an output buffer (an io.StringIO, an open file, or anything with
+`.write`), so a page is assembled in linear time however many rows it has,
+and the CSS / JS in a template is written with plain single braces.
+
+Slot syntax:
+    {{ name }}            str(value)
+    {{ name:.0f }}        format(value, '.0f')
+    {{ name|e }}          HTML-escaped
+    {{ name|json }}       json.dumps(value)
+"""
+import io
+import json
+import re
+from html import escape
+
+SLOT = re.compile(r'\{\{\s*([A-Za-z_]\w*)\s*(?::([^|}]+?))?\s*(?:\|\s*(\w+)\s*)?\}\}')
+
+FILTERS = {
+    'e': lambda v: escape(str(v), quote=True),
+    'json': json.dumps,
+}
+
+
+class Template:
+    """A template compiled to one f-string over its slot values."""
+
+    def __init__(self, source):
+        self.source = source
+        ns = {f'_{name}': fn for name, fn in FILTERS.items()}
+        names = {}  # slot name -> local variable
+        body = []
+        pos = 0
+        for i, m in enumerate(SLOT.finditer(source)):
+            name, spec, flt = m.groups()
+            if flt is not None and flt not in FILTERS:
+                raise ValueError(f'unknown template filter {flt!r} in {m.group(0)}')
+            body.append(source[pos:m.start()].replace('{', '{{').replace('}', '}}'))
+            var = names.setdefault(name, f'v{len(names)}')
+            if spec:
+                ns[f'_s{i}'] = spec
+                var = f'format({var}, _s{i})'
+            body.append('{' + (f'_{flt}({var})' if flt else var) + '}')
+            pos = m.end()
+        body.append(source[pos:].replace('{', '{{').replace('}', '}}'))
+
+        loads = ''.join(f'    {var} = ctx[{name!r}]\n' for name, var in names.items())
+        code = f'def render(ctx):\n{loads}    return f{"".join(body)!r}\n'
+        exec(compile(code, '<template>', 'exec'), ns)
+        self.names = tuple(names)
+        self._render = ns['render']
+
+    def render_into(self, out, ctx=None, **values):
+        """Write the template to `out` with slots taken from ctx / values."""
+        if ctx is None:
+            ctx = values
+        elif values:
+            ctx = {**ctx, **values}
+        out.write(self._render(ctx))
+
+    def render_each(self, out, rows):
+        """render_into once per context dict in `rows`."""
+        render, write = self._render, out.write
+        for row in rows:
+            write(render(row))
+
+    def render(self, ctx=None, **values):
+        buf = io.StringIO()
+        self.render_into(buf, ctx, **values)
+        return buf.getvalue()